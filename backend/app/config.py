@@ -17,8 +17,26 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "BMSIT Faculty Portal"
     MONGODB_URL: str
     MONGODB_DATABASE: str
+    MONGODB_MIN_POOL_SIZE: int = 10
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_LISTING_READ_PREFERENCE: str = "secondaryPreferred"  # "primary" disables secondary reads
+    MONGODB_MAX_STALENESS_SECONDS: int = 90  # driver minimum is 90
     API_V1_STR: str = "/api/v1"
     
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json or text
+    
+    # Server Settings (used by run.py)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 4
+    SERVER_LOOP: str = "auto"  # picks uvloop when installed
+    SERVER_HTTP: str = "auto"  # picks httptools when installed
+    SERVER_KEEP_ALIVE_SECONDS: int = 15
+    SERVER_BACKLOG: int = 2048
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    
     # JWT Settings
     SECRET_KEY: str
     ALGORITHM: str
@@ -27,6 +45,7 @@ class Settings(BaseSettings):
     # Password Policy
     TEMP_PASSWORD_EXPIRY_DAYS: int = 7
     MIN_PASSWORD_LENGTH: int = 8
+    BCRYPT_ROUNDS: int = 12  # tune with calibrate_bcrypt.py; older hashes are upgraded on login
     
     # Email Settings
     USE_MOCK_EMAIL: bool = True
@@ -36,5 +55,83 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     SMTP_SENDER_EMAIL: str
     SMTP_USE_TLS: bool = True
+    BULK_EMAIL_PER_SECOND: float = 5.0  # shared by all bulk senders in a worker; keep under the SMTP relay's limit
+    BULK_EMAIL_MAX_CONCURRENCY: int = 5
+    
+    # Notification Digest Emails
+    NOTIFICATION_DIGEST_ENABLED: bool = False
+    NOTIFICATION_DIGEST_WINDOW_MINUTES: int = 60
+    NOTIFICATION_DIGEST_MAX_ITEMS: int = 20  # listed per email; the rest are summarised
+    
+    # Notification Sync
+    NOTIFICATION_TOMBSTONE_RETENTION_DAYS: int = 30  # older watermarks get a full resync
+    NOTIFICATION_SYNC_SKEW_SECONDS: int = 5  # watermark lag covering in-flight writes and worker clock skew
+    NOTIFICATION_SYNC_PAGE_SIZE: int = 500  # notifications per sync response; clients follow next_cursor
+    
+    # Idempotency Keys
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # a pending key older than this is considered abandoned
+    IDEMPOTENCY_WAIT_SECONDS: int = 30  # how long a duplicate waits for the first request
+    
+    # Audit Log
+    AUDIT_BUFFER_SIZE: int = 10000  # oldest entries are dropped beyond this
+    AUDIT_FLUSH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 2.0
+    AUDIT_RETENTION_DAYS: int = 365
+    
+    # Admission Control (per worker; excess requests queue, then get 503)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_HASHING_LIMIT: int = 4  # bcrypt-heavy routes; roughly CPU cores per worker
+    ADMISSION_HASHING_QUEUE: int = 32
+    ADMISSION_WRITES_LIMIT: int = 32
+    ADMISSION_WRITES_QUEUE: int = 128
+    ADMISSION_READS_LIMIT: int = 128
+    ADMISSION_READS_QUEUE: int = 512
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
+    
+    # Slow Query Detection (admin-only diagnostics)
+    QUERY_MONITOR_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 100
+    SLOW_QUERY_EXPLAIN: bool = True  # explain each new slow query shape in the background
+    SLOW_QUERY_MAX_SHAPES: int = 200
+    
+    # Event-loop Stall Detection (admin-only diagnostics)
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_INTERVAL_MS: int = 50  # heartbeat period; lag is measured against it
+    LOOP_STALL_THRESHOLD_MS: int = 100
+    LOOP_STALL_MAX_LOCATIONS: int = 100
+    
+    # Request Profiling (admin-only diagnostics)
+    PROFILER_ENABLED: bool = False
+    PROFILER_SAMPLE_RATE: float = 0.0  # fraction of requests profiled without the X-Profile header
+    PROFILER_INTERVAL_MS: float = 1.0
+    PROFILER_MAX_PROFILES: int = 50
+    
+    # Query Result Caching
+    FACULTY_CACHE_MAX_ENTRIES: int = 256
+    CACHE_GENERATION_POLL_SECONDS: float = 2.0  # how quickly other workers' writes invalidate local caches
+    
+    # Background Jobs
+    SCHEDULER_ENABLED: bool = True
+    NOTIFICATION_RETENTION_DAYS: int = 90
+    NOTIFICATION_PRUNE_CRON: str = "30 2 * * *"  # daily at 02:30 UTC
+    
+    # Schema Migrations (migrate.py)
+    MIGRATION_BATCH_SIZE: int = 500
+    MIGRATION_MAX_DOCS_PER_SECOND: float = 1000  # 0 = unthrottled
+    
+    # Pre-hashed Temporary Credentials (per worker, memory only; 0 disables)
+    CREDENTIAL_POOL_SIZE: int = 16
+    CREDENTIAL_POOL_REFILL_PAUSE_MS: int = 100
+    
+    # Bulk Credential Resend
+    CREDENTIAL_RESEND_BATCH_SIZE: int = 100
+    CREDENTIAL_RESEND_HASH_CONCURRENCY: int = 4  # bcrypt threads; leaves the thread pool to logins
+    
+    # Deleted-user Cleanup
+    CASCADE_BATCH_SIZE: int = 500
+    CASCADE_BATCH_PAUSE_MS: int = 200
+    CASCADE_ARCHIVE_NOTIFICATIONS: bool = False  # copy to notifications_archive before deleting
 
 settings = Settings()
\ No newline at end of file
@@ -1,5 +1,12 @@
+import asyncio
+import logging
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
 from ..config import settings
+from .query_monitor import query_monitor
+
+logger = logging.getLogger(__name__)
 
 class Database:
     client: AsyncIOMotorClient = None
@@ -7,11 +14,88 @@ class Database:
 
 db = Database()
 
+# Indexes the API relies on, per collection
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)]),
+        IndexModel([("role", ASCENDING), ("department", ASCENDING), ("designation", ASCENDING)]),
+        IndexModel([("role", ASCENDING), ("designation", ASCENDING)]),
+    ],
+    "notifications": [
+        IndexModel([("recipient_id", ASCENDING), ("read", ASCENDING), ("digested_at", ASCENDING)]),
+        IndexModel([("read", ASCENDING), ("digested_at", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("read", ASCENDING), ("updated_at", ASCENDING)]),
+        IndexModel([("recipient_id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)]),
+    ],
+    "notification_tombstones": [
+        IndexModel([("deleted_at", ASCENDING)], expireAfterSeconds=settings.NOTIFICATION_TOMBSTONE_RETENTION_DAYS * 86400),
+        IndexModel([("recipient_id", ASCENDING), ("deleted_at", ASCENDING)]),
+    ],
+    "audit_log": [
+        IndexModel([("timestamp", DESCENDING)], expireAfterSeconds=settings.AUDIT_RETENTION_DAYS * 86400),
+        IndexModel([("action", ASCENDING), ("timestamp", DESCENDING)]),
+        IndexModel([("actor_id", ASCENDING), ("timestamp", DESCENDING)]),
+        IndexModel([("target_id", ASCENDING), ("timestamp", DESCENDING)]),
+    ],
+    "background_jobs": [
+        IndexModel([("type", ASCENDING), ("status", ASCENDING)]),
+    ],
+    "meetings": [
+        IndexModel([("attendee_ids", ASCENDING), ("date_time", ASCENDING)]),
+    ],
+    "idempotency_keys": [
+        IndexModel([("created_at", ASCENDING)], expireAfterSeconds=settings.IDEMPOTENCY_TTL_HOURS * 3600),
+    ],
+}
+
+# Read preference for listing endpoints; everything else reads from the primary
+_READ_PREFERENCES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+def _listing_read_preference():
+    mode = settings.MONGODB_LISTING_READ_PREFERENCE
+    if mode == "primary":
+        return Primary()
+    if mode not in _READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference: {mode!r}")
+    return _READ_PREFERENCES[mode](max_staleness=settings.MONGODB_MAX_STALENESS_SECONDS)
+
+LISTING_READ_PREFERENCE = _listing_read_preference()
+
+def listing_collection(name: str):
+    """
+    Collection handle for high-volume listing reads, routed to secondaries
+    within the configured staleness bound. Pair with request_session() so a
+    client still sees its own writes.
+    """
+    return db.database.get_collection(name, read_preference=LISTING_READ_PREFERENCE)
+
 async def connect_to_mongo():
-    db.client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db.client = AsyncIOMotorClient(
+        settings.MONGODB_URL,
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        event_listeners=[query_monitor] if settings.QUERY_MONITOR_ENABLED else []
+    )
     db.database = db.client[settings.MONGODB_DATABASE]
-    print("Connected to MongoDB")
+    logger.info("Connected to MongoDB")
 
 async def close_mongo_connection():
     db.client.close()
-    print("Closed MongoDB connection")
\ No newline at end of file
+    logger.info("Closed MongoDB connection")
+
+async def warm_up_connection_pool():
+    """Open the minimum number of pooled connections before serving traffic"""
+    await asyncio.gather(*[
+        db.client.admin.command("ping")
+        for _ in range(max(settings.MONGODB_MIN_POOL_SIZE, 1))
+    ])
+
+async def ensure_indexes():
+    """Create any missing indexes from INDEXES (no-op for existing ones)"""
+    for collection_name, indexes in INDEXES.items():
+        await db.database[collection_name].create_indexes(indexes)
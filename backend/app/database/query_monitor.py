@@ -0,0 +1,292 @@
+import asyncio
+import bisect
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from pymongo import monitoring
+from ..config import settings
+from ..utils.metrics import register_metrics_source
+
+logger = logging.getLogger(__name__)
+
+# Commands whose latency is tracked; getMore and admin commands are not attributed
+MONITORED_COMMANDS = {"find", "aggregate", "count", "distinct", "insert", "update", "delete", "findAndModify"}
+# Commands explain() accepts (explaining a write does not apply it)
+EXPLAINABLE_COMMANDS = MONITORED_COMMANDS - {"insert"}
+# Session and transport fields that cannot be sent inside an explain
+_NOT_EXPLAINABLE_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"}
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+MAX_PENDING_EXPLAINS = 50
+
+
+def normalize_shape(value: Any) -> Any:
+    """
+    A filter, sort or pipeline with every literal replaced by "?", so queries
+    that differ only in their values share one shape. Lists of literals
+    (e.g. $in) collapse to a single placeholder; "$field" paths are kept.
+    """
+    if isinstance(value, dict):
+        return {key: normalize_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if any(isinstance(item, (dict, list, tuple)) for item in value):
+            return [normalize_shape(item) for item in value]
+        return ["?"] if value else []
+    if isinstance(value, str) and value.startswith("$"):
+        return value  # field path in an aggregation expression
+    return "?"
+
+
+def command_shape(command_name: str, command: dict) -> dict:
+    """The parts of a command that decide how it is executed, normalized"""
+    if command_name == "insert":
+        return {}
+    if command_name == "aggregate":
+        return {"pipeline": normalize_shape(command.get("pipeline", []))}
+    if command_name in ("update", "delete"):
+        # Bulk writes are described by their first statement
+        statements = command.get(f"{command_name}s") or [{}]
+        query = statements[0].get("q", {})
+    elif command_name == "find":
+        query = command.get("filter", {})
+    else:
+        query = command.get("query", {})
+
+    shape = {"filter": normalize_shape(query)}
+    if command_name == "distinct":
+        shape["key"] = command.get("key")
+    if command.get("sort"):
+        # Sort direction is structural, not a literal
+        shape["sort"] = dict(command["sort"])
+    return shape
+
+
+def _explain_summary(explain: dict) -> dict:
+    """Docs/keys examined, documents returned and plan stages from explain output"""
+    stats = explain.get("executionStats")
+    plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+    if stats is None:
+        # aggregate: the query part lives in the first stage
+        for stage in explain.get("stages", []):
+            cursor = stage.get("$cursor")
+            if cursor:
+                stats = cursor.get("executionStats")
+                plan = cursor.get("queryPlanner", {}).get("winningPlan", {})
+                break
+    stats = stats or {}
+
+    stages: List[str] = []
+    node = plan.get("queryPlan", plan)
+    while node:
+        stage = node.get("stage", "?")
+        stages.append(f"{stage}({node['indexName']})" if node.get("indexName") else stage)
+        node = node.get("inputStage") or (node.get("inputStages") or [None])[0]
+
+    docs_examined = stats.get("totalDocsExamined", 0)
+    returned = stats.get("nReturned", 0)
+    return {
+        "docs_examined": docs_examined,
+        "keys_examined": stats.get("totalKeysExamined", 0),
+        "returned": returned,
+        "examined_per_returned": round(docs_examined / max(returned, 1), 2),
+        "execution_ms": stats.get("executionTimeMillis"),
+        "plan": " <- ".join(stages),
+        "collection_scan": "COLLSCAN" in stages,
+    }
+
+
+class LatencyStats:
+    """Latency histogram for one collection/command pair"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.slow = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, duration_ms: float, slow: bool):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        if slow:
+            self.slow += 1
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the percentile, capped at max_ms"""
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                bound = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return round(min(bound, self.max_ms), 2)
+        return 0.0
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "slow": self.slow,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class QueryMonitor(monitoring.CommandListener):
+    """
+    Command listener recording per-collection, per-command latency. Commands
+    slower than SLOW_QUERY_THRESHOLD_MS are grouped by normalized shape; the
+    first time a shape turns up slow it is explained (executionStats) by a
+    background task, outside the request that ran it.
+
+    Listener callbacks run on Motor's driver threads, so state is guarded by a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: Dict[Tuple[Any, int], Tuple[str, str, dict]] = {}
+        self.latency: Dict[Tuple[str, str], LatencyStats] = {}
+        self.slow_shapes: Dict[Tuple[str, str, str], dict] = {}
+        self.dropped_shapes = 0
+        self._explain_queue: Deque[Tuple[Tuple[str, str, str], dict]] = deque(maxlen=MAX_PENDING_EXPLAINS)
+        self._task: Optional[asyncio.Task] = None
+
+    # CommandListener interface
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        if event.command_name not in MONITORED_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            return
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = (collection, event.command_name, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        collection, command_name, command = started
+        duration_ms = event.duration_micros / 1000
+        slow = duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS
+        shape = json.dumps(command_shape(command_name, command), default=str) if slow else None
+
+        with self._lock:
+            stats = self.latency.setdefault((collection, command_name), LatencyStats())
+            stats.record(duration_ms, slow)
+            if failed:
+                stats.errors += 1
+            if slow:
+                self._record_slow((collection, command_name, shape), command, duration_ms)
+
+    def _record_slow(self, key: Tuple[str, str, str], command: dict, duration_ms: float):
+        entry = self.slow_shapes.get(key)
+        if entry is None:
+            if len(self.slow_shapes) >= settings.SLOW_QUERY_MAX_SHAPES:
+                self.dropped_shapes += 1
+                return
+            entry = self.slow_shapes[key] = {
+                "collection": key[0],
+                "command": key[1],
+                "shape": key[2],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "first_seen": datetime.utcnow(),
+                "explain": None,
+            }
+            if settings.SLOW_QUERY_EXPLAIN and key[1] in EXPLAINABLE_COMMANDS:
+                self._explain_queue.append((key, command))
+        entry["count"] += 1
+        entry["total_ms"] += duration_ms
+        entry["max_ms"] = max(entry["max_ms"], duration_ms)
+        entry["last_seen"] = datetime.utcnow()
+
+    # Out-of-band explain
+
+    async def start(self):
+        if settings.SLOW_QUERY_EXPLAIN:
+            self._task = asyncio.create_task(self._explain_pending())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _explain_pending(self):
+        from .database import db  # database.py registers this monitor, so import late
+
+        while True:
+            await asyncio.sleep(1)
+            while self._explain_queue:
+                key, command = self._explain_queue.popleft()
+                explainable = {
+                    field: value for field, value in command.items()
+                    if not field.startswith("$") and field not in _NOT_EXPLAINABLE_FIELDS
+                }
+                try:
+                    explain = await db.database.command(
+                        {"explain": explainable, "verbosity": "executionStats"}
+                    )
+                    result = _explain_summary(explain)
+                except Exception as e:
+                    result = {"error": str(e)}
+                result["explained_at"] = datetime.utcnow()
+                with self._lock:
+                    if key in self.slow_shapes:
+                        self.slow_shapes[key]["explain"] = result
+                if result.get("collection_scan"):
+                    logger.warning(
+                        "Slow query scans the whole collection",
+                        extra={"collection": key[0], "command": key[1], "shape": key[2]}
+                    )
+
+    # Reporting
+
+    def worst(self, limit: int, sort: str = "total_ms") -> List[dict]:
+        """Slow query shapes, worst first by total_ms, max_ms or count"""
+        with self._lock:
+            entries = [dict(entry) for entry in self.slow_shapes.values()]
+        for entry in entries:
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 2)
+            entry["total_ms"] = round(entry["total_ms"], 2)
+            entry["max_ms"] = round(entry["max_ms"], 2)
+        entries.sort(key=lambda entry: entry[sort], reverse=True)
+        return entries[:limit]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+                "slow_shapes": len(self.slow_shapes),
+                "dropped_shapes": self.dropped_shapes,
+                "pending_explains": len(self._explain_queue),
+                "commands": {
+                    f"{collection}.{command}": stats.summary()
+                    for (collection, command), stats in sorted(self.latency.items())
+                },
+            }
+
+
+# Singleton instance
+query_monitor = QueryMonitor()
+register_metrics_source("queries", query_monitor.stats)
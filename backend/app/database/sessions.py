@@ -0,0 +1,103 @@
+import base64
+from contextvars import ContextVar
+from typing import Optional
+import bson
+from motor.motor_asyncio import AsyncIOMotorClientSession
+from .database import db
+
+# Clients echo this header back so reads on secondaries observe their own writes
+CAUSAL_TOKEN_HEADER = b"x-causal-token"
+
+# Per-request holder {"token": ..., "token_time": ..., "session": ...} created by CausalConsistencyMiddleware
+_request_state: ContextVar[Optional[dict]] = ContextVar("causal_state", default=None)
+
+
+def _encode_token(session: AsyncIOMotorClientSession) -> Optional[str]:
+    if session.operation_time is None or session.cluster_time is None:
+        return None  # standalone server: nothing to carry over
+    raw = bson.encode({"clusterTime": session.cluster_time, "operationTime": session.operation_time})
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _apply_token(session: AsyncIOMotorClientSession, token: str):
+    try:
+        state = bson.decode(base64.urlsafe_b64decode(token.encode()))
+        session.advance_cluster_time(state["clusterTime"])
+        session.advance_operation_time(state["operationTime"])
+    except Exception:
+        pass  # a malformed or foreign token only loses read-your-writes
+
+
+async def request_session() -> Optional[AsyncIOMotorClientSession]:
+    """
+    Causally consistent session for the current request, started on first use
+    and seeded from the client's X-Causal-Token. Reads through it (including
+    secondary reads) are guaranteed to see the client's earlier writes.
+    """
+    state = _request_state.get()
+    if state is None:
+        return None
+    if state["session"] is None:
+        session = await db.client.start_session(causal_consistency=True)
+        if state["token"]:
+            _apply_token(session, state["token"])
+        state["token_time"] = session.operation_time
+        state["session"] = session
+    return state["session"]
+
+
+def token_operation_time():
+    """
+    Operation time the client's X-Causal-Token carried in, i.e. where its
+    previous request left off, unaffected by queries run in this request.
+    Set once request_session() has been called.
+    """
+    state = _request_state.get()
+    return state["token_time"] if state else None
+
+
+async def fork_session(session: AsyncIOMotorClientSession) -> AsyncIOMotorClientSession:
+    """
+    A new causally consistent session starting at `session`'s causal
+    position, for work that may outlive the request owning `session`. The
+    caller ends it.
+    """
+    forked = await db.client.start_session(causal_consistency=True)
+    if session.cluster_time is not None:
+        forked.advance_cluster_time(session.cluster_time)
+    if session.operation_time is not None:
+        forked.advance_operation_time(session.operation_time)
+    return forked
+
+
+class CausalConsistencyMiddleware:
+    """Returns an updated X-Causal-Token for requests that used a session and ends the session"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers", []))
+        state = {
+            "token": headers.get(CAUSAL_TOKEN_HEADER, b"").decode("latin-1") or None,
+            "token_time": None,
+            "session": None
+        }
+        context_token = _request_state.set(state)
+
+        async def send_with_token(message):
+            if message["type"] == "http.response.start" and state["session"] is not None:
+                token = _encode_token(state["session"])
+                if token:
+                    message["headers"] = list(message.get("headers", [])) + [(CAUSAL_TOKEN_HEADER, token.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_token)
+        finally:
+            if state["session"] is not None:
+                await state["session"].end_session()
+            _request_state.reset(context_token)
@@ -1,10 +1,64 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routes import notifications, auth, faculty
-from .database.database import connect_to_mongo, close_mongo_connection
+from .routes import notifications, auth, faculty, audit, admin, meetings
+from .middleware.profiling import ProfilingMiddleware
+from .middleware.request_logging import RequestLoggingMiddleware
+from .middleware.admission import AdmissionControlMiddleware
+from .middleware.content_negotiation import ContentNegotiationMiddleware
+from .database.sessions import CausalConsistencyMiddleware
+from .utils.log_utils import setup_logging, shutdown_logging
+from .utils.serialization import NegotiatedResponse
+from .utils.loop_watchdog import loop_watchdog
+from .database.database import connect_to_mongo, close_mongo_connection, warm_up_connection_pool, ensure_indexes
+from .database.query_monitor import query_monitor
+from .services.scheduler import scheduler
+from .services.maintenance import register_maintenance_jobs
+from .services.cascade import cascade_runner
+from .services.credential_resend import credential_resend_runner
+from .services.credential_pool import credential_pool
+from .services.query_cache import generation_poller
+from .services.audit import audit_logger
 from .config import settings
 
-app = FastAPI(title=settings.PROJECT_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open resources before accepting traffic and release them after draining"""
+    setup_logging()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        await loop_watchdog.start()
+    await connect_to_mongo()
+    await warm_up_connection_pool()
+    # TTL and lookup indexes must exist before the first request, not the first check_indexes run
+    await ensure_indexes()
+    if settings.QUERY_MONITOR_ENABLED:
+        await query_monitor.start()
+    await generation_poller.start()
+    await audit_logger.start()
+    await credential_pool.start()
+    if settings.SCHEDULER_ENABLED:
+        register_maintenance_jobs()
+        await scheduler.start()
+    
+    yield
+    
+    await scheduler.stop()
+    await cascade_runner.stop()
+    await credential_resend_runner.stop()
+    await credential_pool.stop()
+    await generation_poller.stop()
+    await audit_logger.stop()
+    await query_monitor.stop()
+    await close_mongo_connection()
+    await loop_watchdog.stop()
+    shutdown_logging()
+
+# Routes render JSON, or MessagePack for clients that send Accept: application/msgpack
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan, default_response_class=NegotiatedResponse)
+
+# Load shedding per route class (innermost, so 503s still get CORS and request ids)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -13,20 +67,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Causal-Token"],
 )
 
-@app.on_event("startup")
-async def startup_event():
-    await connect_to_mongo()
+# Response encoding chosen from the Accept header
+app.add_middleware(ContentNegotiationMiddleware)
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    await close_mongo_connection()
+# Read-your-writes across requests for reads routed to secondaries
+app.add_middleware(CausalConsistencyMiddleware)
+
+# Request profiling (added only when enabled, so there is no overhead otherwise)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Request ids and access logging (outermost, so ids cover profiled requests too)
+app.add_middleware(RequestLoggingMiddleware)
 
 # Register routers
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(faculty.router, prefix=settings.API_V1_STR)
 app.include_router(notifications.router, prefix=settings.API_V1_STR)
+app.include_router(meetings.router, prefix=settings.API_V1_STR)
+app.include_router(audit.router, prefix=settings.API_V1_STR)
+app.include_router(admin.router, prefix=settings.API_V1_STR)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import re
+import time
+from typing import List, Optional, Tuple
+from ..config import settings
+from ..utils.metrics import register_metrics_source
+
+# Routes whose cost is dominated by bcrypt; matched against the path below API_V1_STR.
+# Anything else is a read (GET/HEAD and READ_ROUTES) or a write (other methods).
+HASHING_ROUTES: List[Tuple[str, re.Pattern]] = [
+    ("POST", re.compile(r"^/auth/login$")),
+    ("POST", re.compile(r"^/auth/first-time-setup$")),
+    ("POST", re.compile(r"^/auth/change-password$")),
+    ("POST", re.compile(r"^/faculty/?$")),
+    ("POST", re.compile(r"^/faculty/[^/]+/resend-credentials$")),
+]
+
+# Read-only routes that take their input as a request body
+READ_ROUTES: List[Tuple[str, re.Pattern]] = [
+    ("POST", re.compile(r"^/faculty/batch-get$")),
+]
+
+# Never queued or shed, so operators can still diagnose an overloaded worker
+EXEMPT_PREFIXES = ("/admin",)
+
+
+class AdmissionClass:
+    """Concurrency limit with a bounded, time-limited wait queue"""
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.admitted = 0
+        self.rejected = 0  # queue full
+        self.timed_out = 0  # waited longer than queue_timeout
+        self._wait_seconds = 0.0
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; False means the request should be shed"""
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+            started = time.perf_counter()
+            acquired = False
+            try:
+                # A cancelled acquire hands back a slot granted at the same moment
+                async with asyncio.timeout(self.queue_timeout):
+                    await self._semaphore.acquire()
+                    acquired = True
+            except TimeoutError:
+                self.timed_out += 1
+                return False
+            except BaseException:
+                if acquired:
+                    self._semaphore.release()
+                raise
+            finally:
+                self.waiting -= 1
+                self._wait_seconds += time.perf_counter() - started
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        shed = self.rejected + self.timed_out
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "waiting": self.waiting,
+            "saturation": round(self.active / self.limit, 3),
+            "peak_waiting": self.peak_waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "shed_ratio": round(shed / (self.admitted + shed), 4) if self.admitted + shed else 0.0,
+            "avg_wait_ms": round(self._wait_seconds / self.admitted * 1000, 2) if self.admitted else 0.0,
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    Assigns each request to the hashing, writes or reads class and admits it
+    only within that class's concurrency limit. Excess requests wait in a
+    bounded queue; when it is full (or the wait times out) the request gets
+    503 with Retry-After, so a bcrypt burst sheds logins before it starves
+    cheap reads.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        timeout = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+        self.classes = {
+            "hashing": AdmissionClass("hashing", settings.ADMISSION_HASHING_LIMIT, settings.ADMISSION_HASHING_QUEUE, timeout),
+            "writes": AdmissionClass("writes", settings.ADMISSION_WRITES_LIMIT, settings.ADMISSION_WRITES_QUEUE, timeout),
+            "reads": AdmissionClass("reads", settings.ADMISSION_READS_LIMIT, settings.ADMISSION_READS_QUEUE, timeout),
+        }
+        register_metrics_source("admission", lambda: {name: c.stats() for name, c in self.classes.items()})
+
+    def classify(self, method: str, path: str) -> Optional[str]:
+        """Admission class for a request, or None if it bypasses admission control"""
+        if method == "OPTIONS" or not path.startswith(settings.API_V1_STR):
+            return None
+        path = path[len(settings.API_V1_STR):]
+        if path.startswith(EXEMPT_PREFIXES):
+            return None
+        for route_method, pattern in HASHING_ROUTES:
+            if method == route_method and pattern.match(path):
+                return "hashing"
+        if method in ("GET", "HEAD"):
+            return "reads"
+        for route_method, pattern in READ_ROUTES:
+            if method == route_method and pattern.match(path):
+                return "reads"
+        return "writes"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        name = self.classify(scope["method"], scope["path"])
+        if name is None:
+            return await self.app(scope, receive, send)
+
+        admission = self.classes[name]
+        if not await admission.acquire():
+            return await self._shed(send, name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.release()
+
+    @staticmethod
+    async def _shed(send, name: str):
+        body = json.dumps({"detail": f"Server busy ({name}), please retry"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
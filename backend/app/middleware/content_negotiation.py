@@ -0,0 +1,30 @@
+from ..config import settings
+from ..utils.serialization import negotiate_media_type, response_media_type
+
+
+class ContentNegotiationMiddleware:
+    """
+    Picks the response encoding for API requests from the Accept header
+    (rendered by NegotiatedResponse) and marks responses as varying by Accept
+    so caches keep the JSON and MessagePack variants apart
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(settings.API_V1_STR):
+            return await self.app(scope, receive, send)
+
+        accept = dict(scope.get("headers", [])).get(b"accept", b"").decode("latin-1")
+        context_token = response_media_type.set(negotiate_media_type(accept))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"vary", b"Accept")]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            response_media_type.reset(context_token)
@@ -0,0 +1,115 @@
+import logging
+import random
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+from bson import ObjectId
+from ..config import settings
+from ..database.database import db
+from ..utils.auth_utils import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+
+class ProfileStore:
+    """The most recent request profiles captured by this worker"""
+
+    def __init__(self, max_profiles: int):
+        self._profiles: deque = deque(maxlen=max_profiles)
+
+    def add(self, profile: dict):
+        self._profiles.append(profile)
+
+    def list(self) -> list:
+        return [
+            {k: v for k, v in profile.items() if k != "session"}
+            for profile in reversed(self._profiles)
+        ]
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        return next((p for p in self._profiles if p["id"] == profile_id), None)
+
+
+profile_store = ProfileStore(settings.PROFILER_MAX_PROFILES)
+
+
+async def _is_admin(authorization: Optional[str]) -> bool:
+    if not authorization or not authorization.startswith("Bearer "):
+        return False
+    payload = decode_access_token(authorization.replace("Bearer ", ""))
+    if not payload or not ObjectId.is_valid(payload.get("sub", "")):
+        return False
+    user = await db.database["users"].find_one({"_id": ObjectId(payload["sub"])}, {"role": 1})
+    return bool(user) and user.get("role") == "admin"
+
+
+class ProfilingMiddleware:
+    """
+    Captures an async-aware wall-clock profile (pyinstrument) of selected requests.
+    A request is profiled when an admin sends `X-Profile: 1`, or at random with
+    probability PROFILER_SAMPLE_RATE. Only installed when PROFILER_ENABLED is set,
+    so it costs nothing otherwise.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        try:
+            from pyinstrument import Profiler
+            self._profiler_class = Profiler
+        except ImportError:
+            logger.warning("Profiling disabled: pyinstrument is not installed")
+            self._profiler_class = None
+
+    async def _trigger(self, scope) -> Optional[str]:
+        headers = dict(scope.get("headers", []))
+        if headers.get(PROFILE_HEADER) in (b"1", b"true"):
+            authorization = headers.get(b"authorization", b"").decode("latin-1")
+            if await _is_admin(authorization):
+                return "header"
+        if settings.PROFILER_SAMPLE_RATE > 0 and random.random() < settings.PROFILER_SAMPLE_RATE:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._profiler_class is None:
+            return await self.app(scope, receive, send)
+
+        trigger = await self._trigger(scope)
+        if trigger is None:
+            return await self.app(scope, receive, send)
+
+        profile_id = uuid4().hex[:12]
+        response_status = {}
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                response_status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = self._profiler_class(
+            interval=settings.PROFILER_INTERVAL_MS / 1000,
+            async_mode="enabled"
+        )
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            session = profiler.stop()
+            profile_store.add({
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "status_code": response_status.get("code"),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "trigger": trigger,
+                "started_at": started_at,
+                "session": session
+            })
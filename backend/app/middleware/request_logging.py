@@ -0,0 +1,43 @@
+import logging
+import time
+from uuid import uuid4
+from ..utils.log_utils import request_id_var
+
+logger = logging.getLogger("app.access")
+
+
+class RequestLoggingMiddleware:
+    """Assigns each request an id (or reuses X-Request-ID) and logs its timing"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers", []))
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid4().hex
+        token = request_id_var.set(request_id)
+        response_status = {"code": 500}
+        start = time.perf_counter()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                response_status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            logger.info(
+                "request",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": response_status["code"],
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                }
+            )
+            request_id_var.reset(token)
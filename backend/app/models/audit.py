@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+class AuditEntry(BaseModel):
+    """A recorded admin action or security event"""
+    id: str = Field(alias="_id")
+    timestamp: datetime
+    action: str  # e.g. faculty.created, auth.login_failed
+    actor_id: Optional[str] = None
+    target_id: Optional[str] = None
+    details: Dict[str, Any] = {}
+    ip_address: Optional[str] = None
+
+    class Config:
+        allow_population_by_field_name = True
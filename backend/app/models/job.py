@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+from datetime import datetime
+
+class JobResponse(BaseModel):
+    """Progress of a long-running background job"""
+    id: str = Field(alias="_id")
+    type: str  # user_deletion, credential_resend
+    status: str  # pending, running, completed, failed
+    target_id: Optional[str] = None
+    progress: Dict[str, int] = {}
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        allow_population_by_field_name = True
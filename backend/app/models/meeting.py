@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class MeetingBase(BaseModel):
+    title: str
+    location: str = ""
+    date_time: datetime
+    duration: int = Field(60, ge=1, le=24 * 60)  # minutes
+    attendees: str  # attendee group, e.g. "All Faculty", "HODs Only" or "Custom"
+    custom_attendee_uids: List[str] = []
+    status: str = "Active"  # Active, Cancelled, Completed
+
+class MeetingCreate(MeetingBase):
+    pass
+
+class MeetingUpdate(BaseModel):
+    title: Optional[str] = None
+    location: Optional[str] = None
+    date_time: Optional[datetime] = None
+    duration: Optional[int] = Field(None, ge=1, le=24 * 60)
+    attendees: Optional[str] = None
+    custom_attendee_uids: Optional[List[str]] = None
+    status: Optional[str] = None
+
+class MeetingResponse(MeetingBase):
+    """A meeting with its attendee group resolved to user IDs"""
+    id: str = Field(alias="_id")
+    scheduled_by: str
+    attendee_ids: List[str]  # expanded when the meeting is saved; includes the scheduler
+    end_time: datetime
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        allow_population_by_field_name = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from bson import ObjectId
 
@@ -39,8 +39,31 @@ class NotificationUpdate(BaseModel):
 
 class NotificationInDB(NotificationBase):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    digested_at: Optional[datetime] = None  # set once included in a digest email
 
     class Config:
         allow_population_by_field_name = True
         arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
\ No newline at end of file
+        json_encoders = {ObjectId: str}
+
+class NotificationBulkRequest(BaseModel):
+    """List of notification IDs for a bulk operation"""
+    ids: List[str]
+
+class NotificationBulkResult(BaseModel):
+    id: str
+    status: str  # updated, unchanged, deleted, not_found, invalid_id
+
+class NotificationBulkResponse(BaseModel):
+    matched_count: int
+    modified_count: int
+    results: List[NotificationBulkResult]
+    unread_counts: Dict[str, int]  # recipient_id -> unread count after the operation
+
+class NotificationSyncResponse(BaseModel):
+    """Delta for GET /notifications/sync"""
+    notifications: List[NotificationInDB]  # created or changed since updated_since
+    deleted_ids: List[str]
+    reset: bool  # true when the client must replace, not patch, its local copy
+    watermark: datetime  # pass as updated_since on the next sync
+    next_cursor: Optional[str] = None  # set while more pages follow; pass back as cursor
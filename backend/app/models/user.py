@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 
@@ -58,12 +58,30 @@ class UserResponse(UserBase):
     is_first_login: bool
     password_change_required: bool
     email_verified: bool
-    last_password_change: Optional[datetime]
+    last_password_change: Optional[datetime] = None
     created_at: datetime
 
     class Config:
         allow_population_by_field_name = True
 
+class UserBatchGetRequest(BaseModel):
+    """User IDs to resolve in one call; results follow this order"""
+    ids: List[str]
+
+class UserBatchGetResult(BaseModel):
+    id: str
+    status: str  # found, not_found, invalid_id
+    user: Optional[UserResponse] = None
+
+class UserBatchGetResponse(BaseModel):
+    found_count: int
+    results: List[UserBatchGetResult]
+
+class PendingSetupResendRequest(BaseModel):
+    """Which pending-setup faculty get new credentials; omitted filters match everyone"""
+    department: Optional[str] = None
+    min_age_days: Optional[int] = Field(None, ge=0)  # accounts created at least this many days ago
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+import os
+from typing import List
+from ..models.user import UserInDB
+from ..middleware.profiling import profile_store
+from ..database.query_monitor import query_monitor
+from ..utils.metrics import collect_metrics
+from ..utils.loop_watchdog import loop_watchdog
+from ..routes.faculty import require_admin
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/metrics", response_model=dict)
+async def get_metrics(admin: UserInDB = Depends(require_admin)):
+    """Counters from every registered metrics source on this worker (Admin only)"""
+    return {"worker_pid": os.getpid(), **collect_metrics()}
+
+@router.get("/slow-queries", response_model=List[dict])
+async def list_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    sort: str = Query("total_ms", pattern="^(total_ms|max_ms|count)$"),
+    admin: UserInDB = Depends(require_admin)
+):
+    """
+    Query shapes slower than SLOW_QUERY_THRESHOLD_MS on this worker, worst first,
+    with explain() results (docs examined per document returned, plan) (Admin only)
+    """
+    return query_monitor.worst(limit, sort)
+
+@router.get("/loop-stalls", response_model=List[dict])
+async def list_loop_stalls(
+    limit: int = Query(20, ge=1, le=100),
+    sort: str = Query("total_ms", pattern="^(total_ms|max_ms|count)$"),
+    admin: UserInDB = Depends(require_admin)
+):
+    """
+    Code locations that blocked this worker's event loop longer than
+    LOOP_STALL_THRESHOLD_MS, worst first, with a sampled stack (Admin only)
+    """
+    return loop_watchdog.worst(limit, sort)
+
+@router.get("/profiles", response_model=List[dict])
+async def list_profiles(admin: UserInDB = Depends(require_admin)):
+    """List request profiles captured by this worker, newest first (Admin only)"""
+    return profile_store.list()
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: str = Query("html", pattern="^(html|text|speedscope)$"),
+    admin: UserInDB = Depends(require_admin)
+):
+    """Download a captured profile as HTML, plain text or speedscope JSON (Admin only)"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer, SpeedscopeRenderer
+    
+    session = profile["session"]
+    filename = f"profile-{profile_id}"
+    if format == "text":
+        return PlainTextResponse(ConsoleRenderer(unicode=True, color=False, show_all=False).render(session))
+    if format == "speedscope":
+        return Response(
+            SpeedscopeRenderer().render(session),
+            media_type="application/json",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.speedscope.json"'}
+        )
+    return HTMLResponse(
+        HTMLRenderer().render(session),
+        headers={"Content-Disposition": f'inline; filename="{filename}.html"'}
+    )
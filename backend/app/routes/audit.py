@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from datetime import datetime
+from ..models.audit import AuditEntry
+from ..models.user import UserInDB
+from ..database.database import db
+from ..services.audit import AUDIT_COLLECTION
+from ..routes.faculty import require_admin
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+@router.get("/", response_model=List[AuditEntry])
+async def get_audit_log(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    action: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    target_id: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, le=1000),
+    admin: UserInDB = Depends(require_admin)
+):
+    """List audit entries, newest first, within an optional time range (Admin only)"""
+    query = {}
+
+    if since or until:
+        query["timestamp"] = {}
+        if since:
+            query["timestamp"]["$gte"] = since
+        if until:
+            query["timestamp"]["$lt"] = until
+    if action:
+        query["action"] = action
+    if actor_id:
+        query["actor_id"] = actor_id
+    if target_id:
+        query["target_id"] = target_id
+
+    cursor = db.database[AUDIT_COLLECTION].find(query).sort("timestamp", -1).skip(skip).limit(limit)
+    entries = await cursor.to_list(length=limit)
+
+    return [AuditEntry(**{**entry, "_id": str(entry["_id"])}) for entry in entries]
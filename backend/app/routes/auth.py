@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Header
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Request
 from typing import Optional
 from datetime import datetime
 from ..models.user import (
@@ -6,15 +6,23 @@ from ..models.user import (
     ChangePasswordRequest, UserResponse, UserInDB
 )
 from ..database.database import db
+from ..database.sessions import request_session
+from ..services.query_cache import users_cache
+from ..services.audit import audit_logger
+from ..services.migrations import upgrade_document
+from ..utils.singleflight import SingleFlight
 from ..utils.auth_utils import (
-    verify_password, hash_password, create_access_token,
-    decode_access_token, validate_password_strength
+    verify_password_async, hash_password_async, create_access_token,
+    decode_access_token, validate_password_strength, password_needs_rehash
 )
 from bson import ObjectId
 from pydantic import BaseModel, Field
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# Every authenticated request loads its user; bursts from one user share the lookup
+_user_lookup_flights = SingleFlight("auth.current_user")
+
 
 class UserUpdate(BaseModel):
     name: Optional[str] = None
@@ -52,31 +60,43 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> UserI
             detail="Invalid token payload"
         )
     
-    user = await db.database["users"].find_one({"_id": ObjectId(user_id)})
+    session = await request_session()
+    user = await _user_lookup_flights.do(
+        user_id,
+        lambda flight_session: db.database["users"].find_one({"_id": ObjectId(user_id)}, session=flight_session),
+        session=session
+    )
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    return UserInDB(**user)
+    return UserInDB(**upgrade_document("users", user))
 
 @router.post("/login", response_model=LoginResponse)
-async def login(login_data: LoginRequest):
+async def login(login_data: LoginRequest, request: Request):
     """
     Login endpoint - handles both temporary and regular passwords
     Returns JWT token and user info
     """
+    client_ip = request.client.host if request.client else None
+    
     # Find user by email
     user = await db.database["users"].find_one({"email": login_data.email})
     
     if not user:
+        audit_logger.record(
+            "auth.login_failed",
+            details={"email": login_data.email, "reason": "unknown_email"},
+            ip_address=client_ip
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
-    user_obj = UserInDB(**user)
+    user_obj = UserInDB(**upgrade_document("users", user))
     
     # Check if account is locked
     if user_obj.account_locked:
@@ -86,7 +106,8 @@ async def login(login_data: LoginRequest):
         )
     
     # Try to verify with regular password first
-    password_valid = verify_password(login_data.password, user_obj.password_hash)
+    password_valid = await verify_password_async(login_data.password, user_obj.password_hash)
+    regular_password_used = password_valid
     
     # If regular password fails and user has temp password, try temp password
     if not password_valid and user_obj.temp_password_hash:
@@ -97,9 +118,16 @@ async def login(login_data: LoginRequest):
                 detail="Temporary password has expired. Please contact administrator."
             )
         
-        password_valid = verify_password(login_data.password, user_obj.temp_password_hash)
+        password_valid = await verify_password_async(login_data.password, user_obj.temp_password_hash)
     
     if not password_valid:
+        audit_logger.record(
+            "auth.login_failed",
+            target_id=str(user_obj.id),
+            details={"email": login_data.email, "reason": "invalid_password"},
+            ip_address=client_ip
+        )
+        
         # Increment failed login attempts
         await db.database["users"].update_one(
             {"_id": user_obj.id},
@@ -115,6 +143,12 @@ async def login(login_data: LoginRequest):
                 {"_id": user_obj.id},
                 {"$set": {"account_locked": True, "updated_at": datetime.utcnow()}}
             )
+            audit_logger.record(
+                "auth.account_locked",
+                target_id=str(user_obj.id),
+                details={"email": login_data.email, "failed_attempts": user_obj.failed_login_attempts + 1},
+                ip_address=client_ip
+            )
         
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -122,14 +156,18 @@ async def login(login_data: LoginRequest):
         )
     
     # Reset failed login attempts on successful login
+    login_update = {
+        "failed_login_attempts": 0,
+        "updated_at": datetime.utcnow()
+    }
+    
+    # Upgrade hashes created with an older bcrypt cost while we have the plaintext
+    if regular_password_used and password_needs_rehash(user_obj.password_hash):
+        login_update["password_hash"] = await hash_password_async(login_data.password)
+    
     await db.database["users"].update_one(
         {"_id": user_obj.id},
-        {
-            "$set": {
-                "failed_login_attempts": 0,
-                "updated_at": datetime.utcnow()
-            }
-        }
+        {"$set": login_update}
     )
     
     # Create access token
@@ -180,7 +218,7 @@ async def first_time_setup(
             detail="No temporary password found"
         )
     
-    if not verify_password(setup_data.temp_password, current_user.temp_password_hash):
+    if not await verify_password_async(setup_data.temp_password, current_user.temp_password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid temporary password"
@@ -196,7 +234,7 @@ async def first_time_setup(
     
     # Update user with new password and optional profile data
     update_data = {
-        "password_hash": hash_password(setup_data.new_password),
+        "password_hash": await hash_password_async(setup_data.new_password),
         "is_first_login": False,
         "password_change_required": False,
         "temp_password_hash": None,
@@ -210,14 +248,22 @@ async def first_time_setup(
     if setup_data.bio:
         update_data["bio"] = setup_data.bio
     
+    session = await request_session()
     await db.database["users"].update_one(
         {"_id": current_user.id},
-        {"$set": update_data}
+        {"$set": update_data},
+        session=session
+    )
+    await users_cache.bump(session)
+    audit_logger.record(
+        "auth.first_time_setup_completed",
+        actor_id=str(current_user.id),
+        target_id=str(current_user.id)
     )
     
     # Fetch updated user
-    updated_user = await db.database["users"].find_one({"_id": current_user.id})
-    updated_user_obj = UserInDB(**updated_user)
+    updated_user = await db.database["users"].find_one({"_id": current_user.id}, session=session)
+    updated_user_obj = UserInDB(**upgrade_document("users", updated_user))
     
     return UserResponse(
         _id=str(updated_user_obj.id),
@@ -244,7 +290,7 @@ async def change_password(
 ):
     """Change password for existing users"""
     # Verify old password
-    if not verify_password(password_data.old_password, current_user.password_hash):
+    if not await verify_password_async(password_data.old_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid current password"
@@ -259,15 +305,23 @@ async def change_password(
         )
     
     # Update password
+    session = await request_session()
     await db.database["users"].update_one(
         {"_id": current_user.id},
         {
             "$set": {
-                "password_hash": hash_password(password_data.new_password),
+                "password_hash": await hash_password_async(password_data.new_password),
                 "last_password_change": datetime.utcnow(),
                 "updated_at": datetime.utcnow()
             }
-        }
+        },
+        session=session
+    )
+    await users_cache.bump(session)
+    audit_logger.record(
+        "auth.password_changed",
+        actor_id=str(current_user.id),
+        target_id=str(current_user.id)
     )
     
     return {"message": "Password changed successfully"}
@@ -317,14 +371,17 @@ async def update_user_profile(
     update_dict["updated_at"] = datetime.utcnow()
     
     # Update user in database
+    session = await request_session()
     await db.database["users"].update_one(
         {"_id": current_user.id},
-        {"$set": update_dict}
+        {"$set": update_dict},
+        session=session
     )
+    await users_cache.bump(session)
     
     # Fetch updated user
-    updated_user = await db.database["users"].find_one({"_id": current_user.id})
-    updated_user_obj = UserInDB(**updated_user)
+    updated_user = await db.database["users"].find_one({"_id": current_user.id}, session=session)
+    updated_user_obj = UserInDB(**upgrade_document("users", updated_user))
     
     return UserResponse(
         _id=str(updated_user_obj.id),
@@ -1,17 +1,45 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+import logging
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Header, Response
 from typing import List, Optional
 from datetime import datetime
-from ..models.user import UserCreate, UserResponse, UserUpdate, UserInDB
-from ..database.database import db
-from ..utils.auth_utils import (
-    hash_password, generate_temp_password, get_temp_password_expiry
+from ..models.user import (
+    UserCreate, UserResponse, UserUpdate, UserInDB,
+    UserBatchGetRequest, UserBatchGetResult, UserBatchGetResponse, PendingSetupResendRequest
 )
+from ..models.job import JobResponse
+from ..config import settings
+from ..database.database import db, listing_collection
+from ..database.sessions import request_session
+from ..utils.auth_utils import get_temp_password_expiry
 from ..services.email_service import email_service
+from ..services.idempotency import run_idempotent
+from ..services.cascade import cascade_runner, JOBS_COLLECTION
+from ..services.credential_pool import credential_pool
+from ..services.credential_resend import credential_resend_runner, pending_setup_filter
+from ..services.query_cache import users_cache
+from ..services.audit import audit_logger
+from ..services.migrations import VERSION_FIELD, current_version, document_version, new_document, upgrade_document
+from ..utils.singleflight import SingleFlight
 from ..routes.auth import get_current_user
 from bson import ObjectId
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/faculty", tags=["faculty"])
 
+# Upper bound on IDs accepted by POST /faculty/batch-get
+MAX_BATCH_GET_IDS = 500
+
+# Cache misses for the same directory page share one query
+_faculty_list_flights = SingleFlight("faculty.list")
+
+# Only the fields UserResponse exposes, plus the schema version so documents
+# still on an old schema can be told apart
+USER_RESPONSE_PROJECTION = {
+    **{field: 1 for field in UserResponse.__fields__ if field != "id"},
+    VERSION_FIELD: 1
+}
+
 async def require_admin(current_user: UserInDB = Depends(get_current_user)) -> UserInDB:
     """Dependency to ensure user is an admin"""
     if current_user.role != "admin":
@@ -21,15 +49,30 @@ async def require_admin(current_user: UserInDB = Depends(get_current_user)) -> U
         )
     return current_user
 
+def _job_location(job_id: str) -> str:
+    """URL of GET /jobs/{job_id}, for Location headers"""
+    return f"{settings.API_V1_STR}{router.prefix}/jobs/{job_id}"
+
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_faculty(
     faculty_data: UserCreate,
-    admin: UserInDB = Depends(require_admin)
+    admin: UserInDB = Depends(require_admin),
+    idempotency_key: Optional[str] = Header(None)
 ):
     """
     Create a new faculty member (Admin only)
     Generates temporary password and sends welcome email
+    Retries carrying the same Idempotency-Key header replay the first response
     """
+    return await run_idempotent(
+        idempotency_key,
+        scope=f"faculty:create:{admin.id}",
+        payload=faculty_data.dict(),
+        handler=lambda: _create_faculty(faculty_data, admin),
+        status_code=status.HTTP_201_CREATED
+    )
+
+async def _create_faculty(faculty_data: UserCreate, admin: UserInDB) -> UserResponse:
     # Check if email already exists
     existing_user = await db.database["users"].find_one({"email": faculty_data.email})
     if existing_user:
@@ -38,9 +81,8 @@ async def create_faculty(
             detail="Email already registered"
         )
     
-    # Generate temporary password
-    temp_password = generate_temp_password()
-    temp_password_hash = hash_password(temp_password)
+    # Temporary password, usually pre-hashed by the credential pool
+    temp_password, temp_password_hash = await credential_pool.take()
     
     # Create user document
     user_dict = faculty_data.dict()
@@ -56,9 +98,18 @@ async def create_faculty(
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
     })
+    user_dict = new_document("users", user_dict)
     
     # Insert into database
-    result = await db.database["users"].insert_one(user_dict)
+    session = await request_session()
+    result = await db.database["users"].insert_one(user_dict, session=session)
+    await users_cache.bump(session)
+    audit_logger.record(
+        "faculty.created",
+        actor_id=str(admin.id),
+        target_id=str(result.inserted_id),
+        details={"email": faculty_data.email, "department": faculty_data.department}
+    )
     
     # Send welcome email
     try:
@@ -68,12 +119,12 @@ async def create_faculty(
             temp_password=temp_password
         )
     except Exception as e:
-        print(f"Warning: Failed to send welcome email: {str(e)}")
+        logger.warning("Failed to send welcome email", extra={"recipient": faculty_data.email, "error": str(e)})
         # Don't fail the request if email fails
     
     # Fetch created user
-    created_user = await db.database["users"].find_one({"_id": result.inserted_id})
-    created_user_obj = UserInDB(**created_user)
+    created_user = await db.database["users"].find_one({"_id": result.inserted_id}, session=session)
+    created_user_obj = UserInDB(**upgrade_document("users", created_user))
     
     return UserResponse(
         _id=str(created_user_obj.id),
@@ -101,7 +152,19 @@ async def get_all_faculty(
     limit: int = Query(100, le=1000),
     admin: UserInDB = Depends(require_admin)
 ):
-    """Get all faculty members with optional filtering (Admin only)"""
+    """
+    Get all faculty members with optional filtering (Admin only)
+    Results are cached until the next write to the users collection; misses
+    read from a secondary when one is within the staleness bound
+    """
+    session = await request_session()
+    await users_cache.catch_up(session)
+    cache_key = (department, designation, skip, limit)
+    cached = users_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = users_cache.generation
+    
     query = {"role": "faculty"}
     
     if department:
@@ -109,8 +172,17 @@ async def get_all_faculty(
     if designation:
         query["designation"] = designation
     
-    faculty_cursor = db.database["users"].find(query).skip(skip).limit(limit)
-    faculty_list = await faculty_cursor.to_list(length=limit)
+    result = await _faculty_list_flights.do(
+        cache_key,
+        lambda flight_session: _load_faculty_page(query, skip, limit, flight_session),
+        session=session
+    )
+    users_cache.set(cache_key, result, generation)
+    return result
+
+async def _load_faculty_page(query: dict, skip: int, limit: int, session) -> List[UserResponse]:
+    faculty_cursor = listing_collection("users").find(query, session=session).skip(skip).limit(limit)
+    faculty_list = [upgrade_document("users", user) for user in await faculty_cursor.to_list(length=limit)]
     
     return [
         UserResponse(
@@ -138,13 +210,8 @@ async def get_pending_setup_faculty(
     admin: UserInDB = Depends(require_admin)
 ):
     """Get faculty members who haven't completed first-time setup (Admin only)"""
-    query = {
-        "role": "faculty",
-        "is_first_login": True
-    }
-    
-    faculty_cursor = db.database["users"].find(query)
-    faculty_list = await faculty_cursor.to_list(length=None)
+    faculty_cursor = db.database["users"].find(pending_setup_filter())
+    faculty_list = [upgrade_document("users", user) for user in await faculty_cursor.to_list(length=None)]
     
     return [
         UserResponse(
@@ -167,6 +234,24 @@ async def get_pending_setup_faculty(
         for user in faculty_list
     ]
 
+@router.post("/pending-setup/resend", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def resend_pending_setup_credentials(
+    request: PendingSetupResendRequest,
+    response: Response,
+    admin: UserInDB = Depends(require_admin)
+):
+    """
+    Send new temporary credentials to every faculty member still pending setup,
+    optionally only one department or accounts older than min_age_days (Admin only).
+    Runs as a background job; poll the URL in the Location header for progress.
+    """
+    query = pending_setup_filter(request.department, request.min_age_days)
+    job = await credential_resend_runner.enqueue(query, request.dict(exclude_none=True), str(admin.id))
+    
+    job["_id"] = str(job["_id"])
+    response.headers["Location"] = _job_location(job["_id"])
+    return JobResponse(**job)
+
 @router.get("/{faculty_id}", response_model=UserResponse)
 async def get_faculty(
     faculty_id: str,
@@ -186,7 +271,7 @@ async def get_faculty(
             detail="Faculty not found"
         )
     
-    user_obj = UserInDB(**user)
+    user_obj = UserInDB(**upgrade_document("users", user))
     
     return UserResponse(
         _id=str(user_obj.id),
@@ -226,19 +311,28 @@ async def update_faculty(
             detail="No valid update data provided"
         )
     
+    session = await request_session()
     result = await db.database["users"].update_one(
         {"_id": ObjectId(faculty_id)},
-        {"$set": update_data}
+        {"$set": update_data},
+        session=session
     )
+    await users_cache.bump(session)
     
     if result.modified_count == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Faculty not found"
         )
+    audit_logger.record(
+        "faculty.updated",
+        actor_id=str(admin.id),
+        target_id=faculty_id,
+        details={"fields": sorted(k for k in update_data if k != "updated_at")}
+    )
     
-    updated_user = await db.database["users"].find_one({"_id": ObjectId(faculty_id)})
-    updated_user_obj = UserInDB(**updated_user)
+    updated_user = await db.database["users"].find_one({"_id": ObjectId(faculty_id)}, session=session)
+    updated_user_obj = UserInDB(**upgrade_document("users", updated_user))
     
     return UserResponse(
         _id=str(updated_user_obj.id),
@@ -261,21 +355,124 @@ async def update_faculty(
 @router.delete("/{faculty_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_faculty(
     faculty_id: str,
+    response: Response,
     admin: UserInDB = Depends(require_admin)
 ):
-    """Delete faculty member (Admin only)"""
+    """
+    Delete faculty member (Admin only)
+    The user's notifications and meeting attendance are cleaned up by a
+    background job whose progress is available at the URL in the Location header
+    """
     if not ObjectId.is_valid(faculty_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid faculty ID"
         )
     
-    result = await db.database["users"].delete_one({"_id": ObjectId(faculty_id)})
+    session = await request_session()
+    user = await db.database["users"].find_one({"_id": ObjectId(faculty_id)}, {"email": 1}, session=session)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Faculty not found"
+        )
+    
+    # Store the cleanup job before deleting, so a crash in between leaves it
+    # for resume_pending instead of orphaning the user's data
+    job_id = await cascade_runner.record(faculty_id, user.get("email"))
+    result = await db.database["users"].delete_one({"_id": ObjectId(faculty_id)}, session=session)
     if result.deleted_count == 0:
+        # Deleted concurrently by another request, which has its own job
+        await cascade_runner.discard(job_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Faculty not found"
         )
+    cascade_runner.start(job_id)
+    await users_cache.bump(session)
+    audit_logger.record(
+        "faculty.deleted",
+        actor_id=str(admin.id),
+        target_id=faculty_id,
+        details={"email": user.get("email")}
+    )
+    
+    response.headers["Location"] = _job_location(job_id)
+
+@router.post("/batch-get", response_model=UserBatchGetResponse)
+async def batch_get_faculty(
+    request: UserBatchGetRequest,
+    admin: UserInDB = Depends(require_admin)
+):
+    """
+    Look up many users by ID with a single query (Admin only)
+    Results follow the request order (duplicates removed) and mark
+    unknown or malformed IDs instead of failing the whole batch
+    """
+    if not request.ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No user IDs provided"
+        )
+    if len(request.ids) > MAX_BATCH_GET_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_GET_IDS} user IDs are allowed per request"
+        )
+    
+    requested = list(dict.fromkeys(request.ids))
+    valid = [ObjectId(user_id) for user_id in requested if ObjectId.is_valid(user_id)]
+    
+    session = await request_session()
+    users = await listing_collection("users").find(
+        {"_id": {"$in": valid}},
+        USER_RESPONSE_PROJECTION,
+        session=session
+    ).to_list(length=None)
+    found = {str(user["_id"]): user for user in users}
+    
+    # Projected documents cannot be upgraded; re-read the ones a migration
+    # has not reached yet in full
+    stale = [user["_id"] for user in users if document_version(user) < current_version("users")]
+    if stale:
+        async for user in listing_collection("users").find({"_id": {"$in": stale}}, session=session):
+            found[str(user["_id"])] = upgrade_document("users", user)
+    
+    results = []
+    for user_id in requested:
+        if not ObjectId.is_valid(user_id):
+            results.append(UserBatchGetResult(id=user_id, status="invalid_id"))
+            continue
+        user = found.get(str(ObjectId(user_id)))
+        if user is None:
+            results.append(UserBatchGetResult(id=user_id, status="not_found"))
+            continue
+        user["_id"] = str(user["_id"])
+        results.append(UserBatchGetResult(id=user_id, status="found", user=UserResponse(**user)))
+    
+    return UserBatchGetResponse(found_count=len(found), results=results)
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    admin: UserInDB = Depends(require_admin)
+):
+    """Get progress of a background job started by a faculty operation (Admin only)"""
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid job ID"
+        )
+    
+    job = await db.database[JOBS_COLLECTION].find_one({"_id": ObjectId(job_id)})
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    job["_id"] = str(job["_id"])
+    return JobResponse(**job)
 
 @router.post("/{faculty_id}/resend-credentials")
 async def resend_credentials(
@@ -296,11 +493,10 @@ async def resend_credentials(
             detail="Faculty not found"
         )
     
-    user_obj = UserInDB(**user)
+    user_obj = UserInDB(**upgrade_document("users", user))
     
-    # Generate new temporary password
-    temp_password = generate_temp_password()
-    temp_password_hash = hash_password(temp_password)
+    # New temporary password
+    temp_password, temp_password_hash = await credential_pool.take()
     
     # Update user with new temp password
     await db.database["users"].update_one(
@@ -321,6 +517,12 @@ async def resend_credentials(
             recipient_name=user_obj.name,
             temp_password=temp_password
         )
+        audit_logger.record(
+            "faculty.credentials_resent",
+            actor_id=str(admin.id),
+            target_id=faculty_id,
+            details={"email": user_obj.email}
+        )
         return {"message": "Credentials sent successfully"}
     except Exception as e:
         raise HTTPException(
@@ -0,0 +1,170 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import List, Optional
+from datetime import datetime, timedelta
+from ..models.meeting import MeetingCreate, MeetingUpdate, MeetingResponse
+from ..models.user import UserInDB
+from ..database.database import db, listing_collection
+from ..database.sessions import request_session
+from ..services.meetings import (
+    MEETINGS_COLLECTION, ATTENDEE_GROUPS, CUSTOM_GROUP, expand_attendees, missing_users
+)
+from ..routes.auth import get_current_user
+from bson import ObjectId
+
+router = APIRouter(prefix="/meetings", tags=["meetings"])
+
+def _meeting_response(meeting: dict) -> MeetingResponse:
+    return MeetingResponse(**{**meeting, "_id": str(meeting["_id"])})
+
+async def _validate_audience(attendees: str, custom_attendee_uids: List[str]):
+    """Reject unknown attendee groups and custom attendees that are not users"""
+    if attendees != CUSTOM_GROUP and attendees not in ATTENDEE_GROUPS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown attendee group: {attendees}"
+        )
+    if attendees == CUSTOM_GROUP and not custom_attendee_uids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Custom meetings need at least one attendee"
+        )
+    unknown = await missing_users(custom_attendee_uids)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown attendee IDs: {', '.join(unknown)}"
+        )
+
+async def _get_meeting(meeting_id: str, session=None) -> dict:
+    if not ObjectId.is_valid(meeting_id):
+        raise HTTPException(status_code=400, detail="Invalid meeting ID")
+
+    meeting = await db.database[MEETINGS_COLLECTION].find_one({"_id": ObjectId(meeting_id)}, session=session)
+    if meeting is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting
+
+def _require_organizer(meeting: dict, current_user: UserInDB):
+    if current_user.role != "admin" and meeting["scheduled_by"] != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the organizer or an admin can change this meeting"
+        )
+
+@router.post("/", response_model=MeetingResponse, status_code=status.HTTP_201_CREATED)
+async def create_meeting(
+    meeting_data: MeetingCreate,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Schedule a meeting
+    The attendee group is expanded to user IDs once, here, so calendar
+    queries never need to read the faculty list
+    """
+    await _validate_audience(meeting_data.attendees, meeting_data.custom_attendee_uids)
+
+    scheduled_by = str(current_user.id)
+    meeting_dict = meeting_data.dict()
+    meeting_dict.update({
+        "scheduled_by": scheduled_by,
+        "attendee_ids": await expand_attendees(
+            meeting_data.attendees, meeting_data.custom_attendee_uids, scheduled_by
+        ),
+        "end_time": meeting_data.date_time + timedelta(minutes=meeting_data.duration),
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    })
+
+    session = await request_session()
+    result = await db.database[MEETINGS_COLLECTION].insert_one(meeting_dict, session=session)
+    return _meeting_response({**meeting_dict, "_id": result.inserted_id})
+
+@router.get("/", response_model=List[MeetingResponse])
+async def get_meetings(
+    start: datetime,
+    end: datetime,
+    attendee_id: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    limit: int = Query(500, le=2000),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Meetings a user attends starting in [start, end), in time order
+    Defaults to the current user; admins may look up anyone's calendar
+    """
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+    if attendee_id is None:
+        attendee_id = str(current_user.id)
+    elif attendee_id != str(current_user.id) and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+    # Served by the (attendee_ids, date_time) index
+    query = {"attendee_ids": attendee_id, "date_time": {"$gte": start, "$lt": end}}
+    if status_filter:
+        query["status"] = status_filter
+
+    cursor = listing_collection(MEETINGS_COLLECTION).find(
+        query, session=await request_session()
+    ).sort("date_time", 1).limit(limit)
+    meetings = await cursor.to_list(length=limit)
+    return [_meeting_response(meeting) for meeting in meetings]
+
+@router.get("/{meeting_id}", response_model=MeetingResponse)
+async def get_meeting(
+    meeting_id: str,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Get a meeting the current user attends (any meeting for admins)"""
+    meeting = await _get_meeting(meeting_id)
+    if current_user.role != "admin" and str(current_user.id) not in meeting.get("attendee_ids", []):
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return _meeting_response(meeting)
+
+@router.put("/{meeting_id}", response_model=MeetingResponse)
+async def update_meeting(
+    meeting_id: str,
+    meeting_update: MeetingUpdate,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Update a meeting (organizer or admin); the audience is re-expanded if it changed"""
+    session = await request_session()
+    meeting = await _get_meeting(meeting_id, session)
+    _require_organizer(meeting, current_user)
+
+    update_data = {k: v for k, v in meeting_update.dict().items() if v is not None}
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No valid update data provided")
+
+    merged = {**meeting, **update_data}
+    if "attendees" in update_data or "custom_attendee_uids" in update_data:
+        await _validate_audience(merged["attendees"], merged["custom_attendee_uids"])
+        update_data["attendee_ids"] = await expand_attendees(
+            merged["attendees"], merged["custom_attendee_uids"], meeting["scheduled_by"]
+        )
+    if "date_time" in update_data or "duration" in update_data:
+        update_data["end_time"] = merged["date_time"] + timedelta(minutes=merged["duration"])
+    update_data["updated_at"] = datetime.utcnow()
+
+    await db.database[MEETINGS_COLLECTION].update_one(
+        {"_id": meeting["_id"]},
+        {"$set": update_data},
+        session=session
+    )
+    return _meeting_response({**meeting, **update_data})
+
+@router.delete("/{meeting_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_meeting(
+    meeting_id: str,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """Delete a meeting (organizer or admin)"""
+    session = await request_session()
+    meeting = await _get_meeting(meeting_id, session)
+    _require_organizer(meeting, current_user)
+
+    await db.database[MEETINGS_COLLECTION].delete_one({"_id": meeting["_id"]}, session=session)
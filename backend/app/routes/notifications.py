@@ -1,19 +1,135 @@
-from fastapi import APIRouter, HTTPException, status, Query
-from typing import List, Optional
-from datetime import datetime
-from ..models.notification import NotificationCreate, NotificationUpdate, NotificationInDB
-from ..database.database import db
+from fastapi import APIRouter, HTTPException, status, Query, Header
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
+from ..config import settings
+from ..models.notification import (
+    NotificationCreate, NotificationUpdate, NotificationInDB,
+    NotificationBulkRequest, NotificationBulkResult, NotificationBulkResponse,
+    NotificationSyncResponse
+)
+from ..database.database import db, listing_collection
+from ..database.sessions import request_session
+from ..services.idempotency import run_idempotent
+from ..services.notification_sync import (
+    TOMBSTONES_COLLECTION, record_deletions, encode_sync_cursor, decode_sync_cursor
+)
+from ..services.migrations import new_document, upgrade_document
+from ..utils.singleflight import SingleFlight
 from bson import ObjectId
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
+# Upper bound on IDs accepted by a single bulk request
+MAX_BULK_IDS = 500
+
+# Clients poll the unread badge in bursts; identical concurrent counts share one query
+_unread_count_flights = SingleFlight("notifications.unread_count")
+
+def _parse_bulk_ids(ids: List[str]) -> List[Tuple[str, Optional[ObjectId]]]:
+    """
+    Validate and de-duplicate bulk IDs, preserving request order
+    Returns: [(requested_id, ObjectId or None if invalid)]
+    """
+    if not ids:
+        raise HTTPException(status_code=400, detail="No notification IDs provided")
+    if len(ids) > MAX_BULK_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_IDS} notification IDs are allowed per request"
+        )
+    
+    parsed = []
+    seen = set()
+    for notification_id in ids:
+        if notification_id in seen:
+            continue
+        seen.add(notification_id)
+        oid = ObjectId(notification_id) if ObjectId.is_valid(notification_id) else None
+        parsed.append((notification_id, oid))
+    return parsed
+
+def _bulk_results(parsed: List[Tuple[str, Optional[ObjectId]]], status_for) -> List[NotificationBulkResult]:
+    """Build per-id outcomes in request order"""
+    return [
+        NotificationBulkResult(id=notification_id, status="invalid_id" if oid is None else status_for(oid))
+        for notification_id, oid in parsed
+    ]
+
+async def _unread_counts(recipient_ids: Set[str], session=None) -> Dict[str, int]:
+    """Current unread counts for the given recipients in a single aggregation"""
+    if not recipient_ids:
+        return {}
+    
+    counts = {recipient_id: 0 for recipient_id in recipient_ids}
+    pipeline = [
+        {"$match": {"recipient_id": {"$in": list(recipient_ids)}, "read": False}},
+        {"$group": {"_id": "$recipient_id", "count": {"$sum": 1}}}
+    ]
+    async for row in db.database["notifications"].aggregate(pipeline, session=session):
+        counts[row["_id"]] = row["count"]
+    return counts
+
+async def _bulk_set_read(ids: List[str], read: bool) -> NotificationBulkResponse:
+    """Set the read flag on many notifications with one update_many"""
+    parsed = _parse_bulk_ids(ids)
+    valid = [oid for _, oid in parsed if oid is not None]
+    session = await request_session()
+    
+    existing = await db.database["notifications"].find(
+        {"_id": {"$in": valid}},
+        {"read": 1, "recipient_id": 1},
+        session=session
+    ).to_list(length=None)
+    found = {doc["_id"]: doc for doc in existing}
+    to_change = {oid for oid in found if found[oid].get("read") != read}
+    
+    modified_count = 0
+    if to_change:
+        result = await db.database["notifications"].update_many(
+            {"_id": {"$in": list(to_change)}, "read": {"$ne": read}},
+            {"$set": {"read": read, "updated_at": datetime.utcnow()}},
+            session=session
+        )
+        modified_count = result.modified_count
+    
+    def status_for(oid):
+        if oid not in found:
+            return "not_found"
+        return "updated" if oid in to_change else "unchanged"
+    
+    recipients = {doc["recipient_id"] for doc in existing if doc.get("recipient_id")}
+    return NotificationBulkResponse(
+        matched_count=len(found),
+        modified_count=modified_count,
+        results=_bulk_results(parsed, status_for),
+        unread_counts=await _unread_counts(recipients, session)
+    )
+
 @router.post("/", response_model=NotificationInDB, status_code=status.HTTP_201_CREATED)
-async def create_notification(notification: NotificationCreate):
-    """Create a new notification"""
-    notification_dict = notification.dict()
-    result = await db.database["notifications"].insert_one(notification_dict)
-    created_notification = await db.database["notifications"].find_one({"_id": result.inserted_id})
-    return NotificationInDB(**created_notification)
+async def create_notification(
+    notification: NotificationCreate,
+    idempotency_key: Optional[str] = Header(None)
+):
+    """
+    Create a new notification
+    Retries carrying the same Idempotency-Key header replay the first response
+    """
+    return await run_idempotent(
+        idempotency_key,
+        scope="notifications:create",
+        # Only what the client sent: created_at/updated_at default to now and
+        # would make every retry look like a different body
+        payload=notification.dict(exclude_unset=True),
+        handler=lambda: _create_notification(notification),
+        status_code=status.HTTP_201_CREATED
+    )
+
+async def _create_notification(notification: NotificationCreate) -> NotificationInDB:
+    notification_dict = new_document("notifications", notification.dict())
+    session = await request_session()
+    result = await db.database["notifications"].insert_one(notification_dict, session=session)
+    created_notification = await db.database["notifications"].find_one({"_id": result.inserted_id}, session=session)
+    return NotificationInDB(**upgrade_document("notifications", created_notification))
 
 @router.get("/", response_model=List[NotificationInDB])
 async def get_notifications(
@@ -22,26 +138,120 @@ async def get_notifications(
     skip: int = 0,
     limit: int = Query(100, le=1000)
 ):
-    """Get all notifications with optional filtering"""
+    """Get all notifications with optional filtering (may be served by a secondary)"""
     query = {}
     if recipient_id:
         query["recipient_id"] = recipient_id
     if read is not None:
         query["read"] = read
     
-    notifications_cursor = db.database["notifications"].find(query).skip(skip).limit(limit)
+    session = await request_session()
+    notifications_cursor = listing_collection("notifications").find(query, session=session).skip(skip).limit(limit)
     notifications = await notifications_cursor.to_list(length=limit)
-    return [NotificationInDB(**notification) for notification in notifications]
+    return [NotificationInDB(**upgrade_document("notifications", notification)) for notification in notifications]
 
 @router.get("/unread-count", response_model=dict)
 async def get_unread_count(recipient_id: str):
-    """Get count of unread notifications for a recipient"""
-    count = await db.database["notifications"].count_documents({
-        "recipient_id": recipient_id,
-        "read": False
-    })
+    """Get count of unread notifications for a recipient (may be served by a secondary)"""
+    session = await request_session()
+    count = await _unread_count_flights.do(
+        recipient_id,
+        lambda flight_session: listing_collection("notifications").count_documents(
+            {"recipient_id": recipient_id, "read": False},
+            session=flight_session
+        ),
+        session=session
+    )
     return {"unread_count": count}
 
+@router.get("/sync", response_model=NotificationSyncResponse)
+async def sync_notifications(
+    recipient_id: str,
+    updated_since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.NOTIFICATION_SYNC_PAGE_SIZE, ge=1, le=1000)
+):
+    """
+    Changes to a recipient's notifications since the previous sync
+    Pass the last response's watermark as updated_since. Without it, or when
+    it predates the tombstone retention, every notification is returned with
+    reset=true and the client should replace its local copy. Results come in
+    pages of `limit`; while next_cursor is set, repeat the call with the same
+    updated_since and cursor=next_cursor. deleted_ids arrive with the last
+    page; apply them after the returned notifications.
+    """
+    after = None
+    if cursor is not None:
+        try:
+            started, last_updated_at, last_id = decode_sync_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid sync cursor")
+        after = (last_updated_at, last_id)
+    else:
+        started = datetime.utcnow()
+    if updated_since is not None and updated_since.tzinfo is not None:
+        updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+    reset = updated_since is None or (
+        updated_since < started - timedelta(days=settings.NOTIFICATION_TOMBSTONE_RETENTION_DAYS)
+    )
+    # Trail the clock so writes still in flight are picked up next time;
+    # clients may see a few rows twice
+    watermark = started - timedelta(seconds=settings.NOTIFICATION_SYNC_SKEW_SECONDS)
+    session = await request_session()
+    
+    # Served by the (recipient_id, updated_at, _id) index
+    query = {"recipient_id": recipient_id}
+    if not reset:
+        query["updated_at"] = {"$gte": updated_since}
+    if after is not None:
+        query["$or"] = [
+            # Not yet migrated documents lack updated_at and sort first
+            {"updated_at": {"$gt": after[0]} if after[0] is not None else {"$ne": None}},
+            {"updated_at": after[0], "_id": {"$gt": after[1]}}
+        ]
+    notifications = await listing_collection("notifications").find(
+        query, session=session
+    ).sort([("updated_at", 1), ("_id", 1)]).limit(limit + 1).to_list(length=limit + 1)
+    has_more = len(notifications) > limit
+    notifications = notifications[:limit]
+    
+    deleted_ids = []
+    # A reset spread over several pages also needs what was deleted meanwhile
+    deleted_since = updated_since if not reset else (watermark if cursor is not None else None)
+    if not has_more and deleted_since is not None:
+        tombstones = await listing_collection(TOMBSTONES_COLLECTION).find(
+            {"recipient_id": recipient_id, "deleted_at": {"$gte": deleted_since}},
+            {"notification_id": 1},
+            session=session
+        ).to_list(length=None)
+        deleted_ids = sorted({tombstone["notification_id"] for tombstone in tombstones})
+    
+    return NotificationSyncResponse(
+        notifications=[NotificationInDB(**upgrade_document("notifications", notification)) for notification in notifications],
+        deleted_ids=deleted_ids,
+        reset=reset,
+        watermark=watermark,
+        next_cursor=encode_sync_cursor(started, notifications[-1]) if has_more else None
+    )
+
+@router.delete("/clear-all", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_all_notifications(recipient_id: str):
+    """Delete all notifications for a recipient"""
+    session = await request_session()
+    existing = await db.database["notifications"].find(
+        {"recipient_id": recipient_id},
+        {"recipient_id": 1},
+        session=session
+    ).to_list(length=None)
+    if not existing:
+        return
+    
+    await record_deletions(existing, session)
+    await db.database["notifications"].delete_many(
+        {"_id": {"$in": [doc["_id"] for doc in existing]}},
+        session=session
+    )
+
 @router.get("/{notification_id}", response_model=NotificationInDB)
 async def get_notification(notification_id: str):
     """Get a specific notification by ID"""
@@ -51,7 +261,7 @@ async def get_notification(notification_id: str):
     notification = await db.database["notifications"].find_one({"_id": ObjectId(notification_id)})
     if notification is None:
         raise HTTPException(status_code=404, detail="Notification not found")
-    return NotificationInDB(**notification)
+    return NotificationInDB(**upgrade_document("notifications", notification))
 
 @router.put("/{notification_id}", response_model=NotificationInDB)
 async def update_notification(notification_id: str, notification_update: NotificationUpdate):
@@ -63,16 +273,18 @@ async def update_notification(notification_id: str, notification_update: Notific
     if not update_data:
         raise HTTPException(status_code=400, detail="No valid update data provided")
     
+    session = await request_session()
     result = await db.database["notifications"].update_one(
         {"_id": ObjectId(notification_id)},
-        {"$set": update_data}
+        {"$set": update_data},
+        session=session
     )
     
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    updated_notification = await db.database["notifications"].find_one({"_id": ObjectId(notification_id)})
-    return NotificationInDB(**updated_notification)
+    updated_notification = await db.database["notifications"].find_one({"_id": ObjectId(notification_id)}, session=session)
+    return NotificationInDB(**upgrade_document("notifications", updated_notification))
 
 @router.delete("/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_notification(notification_id: str):
@@ -80,9 +292,17 @@ async def delete_notification(notification_id: str):
     if not ObjectId.is_valid(notification_id):
         raise HTTPException(status_code=400, detail="Invalid notification ID")
     
-    result = await db.database["notifications"].delete_one({"_id": ObjectId(notification_id)})
-    if result.deleted_count == 0:
+    session = await request_session()
+    notification = await db.database["notifications"].find_one(
+        {"_id": ObjectId(notification_id)},
+        {"recipient_id": 1},
+        session=session
+    )
+    if notification is None:
         raise HTTPException(status_code=404, detail="Notification not found")
+    
+    await record_deletions([notification], session)
+    await db.database["notifications"].delete_one({"_id": notification["_id"]}, session=session)
 
 @router.post("/mark-as-read/{notification_id}", response_model=NotificationInDB)
 async def mark_as_read(notification_id: str):
@@ -94,16 +314,50 @@ async def mark_as_unread(notification_id: str):
     """Mark a notification as unread"""
     return await update_notification(notification_id, NotificationUpdate(read=False))
 
+@router.post("/bulk/mark-as-read", response_model=NotificationBulkResponse)
+async def bulk_mark_as_read(request: NotificationBulkRequest):
+    """Mark many notifications as read in one operation"""
+    return await _bulk_set_read(request.ids, True)
+
+@router.post("/bulk/mark-as-unread", response_model=NotificationBulkResponse)
+async def bulk_mark_as_unread(request: NotificationBulkRequest):
+    """Mark many notifications as unread in one operation"""
+    return await _bulk_set_read(request.ids, False)
+
+@router.post("/bulk/delete", response_model=NotificationBulkResponse)
+async def bulk_delete_notifications(request: NotificationBulkRequest):
+    """Delete many notifications in one operation"""
+    parsed = _parse_bulk_ids(request.ids)
+    valid = [oid for _, oid in parsed if oid is not None]
+    session = await request_session()
+    
+    existing = await db.database["notifications"].find(
+        {"_id": {"$in": valid}},
+        {"recipient_id": 1},
+        session=session
+    ).to_list(length=None)
+    found = {doc["_id"] for doc in existing}
+    
+    deleted_count = 0
+    if found:
+        await record_deletions(existing, session)
+        result = await db.database["notifications"].delete_many({"_id": {"$in": list(found)}}, session=session)
+        deleted_count = result.deleted_count
+    
+    recipients = {doc["recipient_id"] for doc in existing if doc.get("recipient_id")}
+    return NotificationBulkResponse(
+        matched_count=len(found),
+        modified_count=deleted_count,
+        results=_bulk_results(parsed, lambda oid: "deleted" if oid in found else "not_found"),
+        unread_counts=await _unread_counts(recipients, session)
+    )
+
 @router.post("/mark-all-as-read", response_model=dict)
 async def mark_all_as_read(recipient_id: str):
     """Mark all notifications as read for a recipient"""
     result = await db.database["notifications"].update_many(
-        {"recipient_id": recipient_id},
-        {"$set": {"read": True, "updated_at": datetime.utcnow()}}
+        {"recipient_id": recipient_id, "read": False},
+        {"$set": {"read": True, "updated_at": datetime.utcnow()}},
+        session=await request_session()
     )
-    return {"updated_count": result.modified_count}
-
-@router.delete("/clear-all", status_code=status.HTTP_204_NO_CONTENT)
-async def clear_all_notifications(recipient_id: str):
-    """Delete all notifications for a recipient"""
-    await db.database["notifications"].delete_many({"recipient_id": recipient_id})
\ No newline at end of file
+    return {"updated_count": result.modified_count}
\ No newline at end of file
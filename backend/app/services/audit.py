@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pymongo.errors import BulkWriteError
+from ..config import settings
+from ..database.database import db
+from ..utils.metrics import register_metrics_source
+
+logger = logging.getLogger(__name__)
+
+AUDIT_COLLECTION = "audit_log"
+DUPLICATE_KEY_ERROR = 11000
+
+
+class AuditLogger:
+    """
+    Non-blocking audit trail.
+    record() only appends to an in-memory ring buffer; a background task writes
+    the buffer with insert_many when it reaches AUDIT_FLUSH_SIZE entries or every
+    AUDIT_FLUSH_INTERVAL_SECONDS. If Mongo falls behind, the buffer holds at most
+    AUDIT_BUFFER_SIZE entries and the oldest are dropped (and counted).
+    """
+
+    def __init__(self, buffer_size: int, flush_size: int, flush_interval: float):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+
+    def record(
+        self,
+        action: str,
+        actor_id: Optional[str] = None,
+        target_id: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None
+    ):
+        """Queue an audit event; never blocks or raises"""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1  # the append below evicts the oldest entry
+        self._buffer.append({
+            "timestamp": datetime.utcnow(),
+            "action": action,
+            "actor_id": actor_id,
+            "target_id": target_id,
+            "details": details or {},
+            "ip_address": ip_address
+        })
+        self.recorded += 1
+        if len(self._buffer) >= self.flush_size:
+            self._wakeup.set()
+
+    def stats(self) -> dict:
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "buffered": len(self._buffer)
+        }
+
+    async def start(self):
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the background task and write whatever is still buffered"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._buffer:
+            if not await self.flush():
+                break
+
+    async def flush(self) -> bool:
+        """Write up to one batch; returns False if the write failed"""
+        batch = []
+        while self._buffer and len(batch) < self.flush_size:
+            batch.append(self._buffer.popleft())
+        if not batch:
+            return True
+
+        try:
+            await db.database[AUDIT_COLLECTION].insert_many(batch, ordered=False)
+            self.written += len(batch)
+            return True
+        except BulkWriteError as e:
+            # Entries without a write error were inserted, and a duplicate key
+            # means an earlier attempt already wrote that entry (insert_many set
+            # its _id, so retries are idempotent)
+            failed = {
+                error["index"] for error in e.details.get("writeErrors", [])
+                if error.get("code") != DUPLICATE_KEY_ERROR
+            }
+            self.written += len(batch) - len(failed)
+            retry = [entry for index, entry in enumerate(batch) if index in failed]
+            error_message = str(e)
+        except Exception as e:
+            # Unknown outcome (e.g. a timeout after the server applied the
+            # insert); the retry reports already-written entries as duplicates
+            retry = batch
+            error_message = str(e)
+
+        if not retry:
+            return True
+        logger.warning("Failed to write audit entries", extra={"count": len(retry), "error": error_message})
+        # Put the entries back in front of newer ones, keeping within the bound
+        room = self._buffer.maxlen - len(self._buffer)
+        self.dropped += max(len(retry) - room, 0)
+        self._buffer.extendleft(reversed(retry[:room]))
+        return False
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._buffer:
+                if not await self.flush():
+                    await asyncio.sleep(self.flush_interval)
+                    break
+
+
+# Singleton instance
+audit_logger = AuditLogger(
+    buffer_size=settings.AUDIT_BUFFER_SIZE,
+    flush_size=settings.AUDIT_FLUSH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS
+)
+register_metrics_source("audit_log", audit_logger.stats)
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Set, Tuple
+from uuid import uuid4
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from ..config import settings
+from ..database.database import db
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "background_jobs"
+JOB_TYPE = "user_deletion"
+LEASE_SECONDS = 120
+MAX_ATTEMPTS = 5
+
+# A cascade step removes one batch of a deleted user's data and returns how many
+# documents it processed; 0 means the step is finished.
+CascadeStep = Callable[[str, int], Awaitable[int]]
+
+async def _cascade_notifications(user_id: str, batch_size: int) -> int:
+    """Delete (or archive, then delete) one batch of the user's notifications"""
+    notifications = db.database["notifications"]
+    projection = None if settings.CASCADE_ARCHIVE_NOTIFICATIONS else {"_id": 1}
+    batch = await notifications.find({"recipient_id": user_id}, projection).limit(batch_size).to_list(length=batch_size)
+    if not batch:
+        return 0
+
+    if settings.CASCADE_ARCHIVE_NOTIFICATIONS:
+        archived_at = datetime.utcnow()
+        try:
+            await db.database["notifications_archive"].insert_many(
+                [{**doc, "archived_at": archived_at} for doc in batch],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            # Documents archived by a run that crashed before deleting them are fine
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+
+    await notifications.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+    return len(batch)
+
+CASCADE_STEPS: List[Tuple[str, CascadeStep]] = [
+    ("notifications", _cascade_notifications),
+]
+
+def register_cascade_step(name: str, step: CascadeStep):
+    """Add per-user data that must be cleaned up when a user is deleted"""
+    CASCADE_STEPS.append((name, step))
+
+
+class CascadeRunner:
+    """
+    Cleans up a deleted user's data in throttled batches.
+    Progress lives in a background_jobs document so a job interrupted by a
+    crash or shutdown is resumed by the next resume_pending() pass.
+    """
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def record(self, user_id: str, user_email: str) -> str:
+        """
+        Store the deletion job for a user before the user document is deleted,
+        so a crash in between still leaves a job for resume_pending(). The job
+        is leased to this worker; start() it once the user is gone, or
+        discard() it if the deletion did not happen.
+        """
+        now = datetime.utcnow()
+        result = await db.database[JOBS_COLLECTION].insert_one({
+            "type": JOB_TYPE,
+            "status": "pending",
+            "target_id": user_id,
+            "target_email": user_email,
+            "progress": {name: 0 for name, _ in CASCADE_STEPS},
+            "completed_steps": [],
+            "lease_owner": self.worker_id,
+            "lease_until": now + timedelta(seconds=LEASE_SECONDS),
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "completed_at": None
+        })
+        return str(result.inserted_id)
+
+    async def discard(self, job_id: str):
+        """Drop a recorded job whose user was not deleted by this request"""
+        await db.database[JOBS_COLLECTION].delete_one({"_id": ObjectId(job_id), "status": "pending"})
+
+    def start(self, job_id):
+        task = asyncio.create_task(self._run(ObjectId(job_id)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def resume_pending(self):
+        """Restart unfinished jobs whose lease has lapsed"""
+        cursor = db.database[JOBS_COLLECTION].find(
+            {
+                "type": JOB_TYPE,
+                "status": {"$in": ["pending", "running"]},
+                "$or": [{"lease_until": None}, {"lease_until": {"$lt": datetime.utcnow()}}]
+            },
+            {"_id": 1}
+        )
+        async for job in cursor:
+            self.start(job["_id"])
+
+    async def stop(self):
+        """Cancel in-progress jobs; their leases lapse and they resume elsewhere"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _claim(self, job_id: ObjectId) -> dict:
+        now = datetime.utcnow()
+        return await db.database[JOBS_COLLECTION].find_one_and_update(
+            {
+                "_id": job_id,
+                "status": {"$in": ["pending", "running"]},
+                "$or": [
+                    {"lease_until": None},
+                    {"lease_until": {"$lt": now}},
+                    {"lease_owner": self.worker_id}
+                ]
+            },
+            {"$set": {
+                "status": "running",
+                "lease_owner": self.worker_id,
+                "lease_until": now + timedelta(seconds=LEASE_SECONDS),
+                "updated_at": now
+            }}
+        )
+
+    async def _run(self, job_id: ObjectId):
+        job = await self._claim(job_id)
+        if job is None:
+            return  # finished, or another worker holds it
+
+        jobs = db.database[JOBS_COLLECTION]
+        user_id = job["target_id"]
+        pause = settings.CASCADE_BATCH_PAUSE_MS / 1000
+        try:
+            if await db.database["users"].find_one({"_id": ObjectId(user_id)}, {"_id": 1}):
+                # Recorded ahead of a deletion that never went through; keep the data
+                await jobs.update_one(
+                    {"_id": job_id},
+                    {"$set": {
+                        "status": "failed",
+                        "error": "User was not deleted",
+                        "lease_owner": None,
+                        "lease_until": None,
+                        "updated_at": datetime.utcnow()
+                    }}
+                )
+                return
+
+            for name, step in CASCADE_STEPS:
+                if name in job.get("completed_steps", []):
+                    continue
+                while True:
+                    processed = await step(user_id, settings.CASCADE_BATCH_SIZE)
+                    now = datetime.utcnow()
+                    if processed == 0:
+                        await jobs.update_one(
+                            {"_id": job_id},
+                            {"$addToSet": {"completed_steps": name}, "$set": {"updated_at": now}}
+                        )
+                        break
+                    await jobs.update_one(
+                        {"_id": job_id},
+                        {
+                            "$inc": {f"progress.{name}": processed},
+                            "$set": {"lease_until": now + timedelta(seconds=LEASE_SECONDS), "updated_at": now}
+                        }
+                    )
+                    # Throttle so a large cleanup never saturates Mongo
+                    await asyncio.sleep(pause)
+
+            now = datetime.utcnow()
+            await jobs.update_one(
+                {"_id": job_id},
+                {"$set": {
+                    "status": "completed",
+                    "lease_owner": None,
+                    "lease_until": None,
+                    "updated_at": now,
+                    "completed_at": now
+                }}
+            )
+            logger.info("Deletion cleanup completed", extra={"user_id": user_id, "job_id": str(job_id)})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("Deletion cleanup failed", extra={"user_id": user_id, "job_id": str(job_id)})
+            # Leave the job resumable for the next resume pass, up to MAX_ATTEMPTS
+            attempts = job.get("attempts", 0) + 1
+            await jobs.update_one(
+                {"_id": job_id},
+                {"$set": {
+                    "status": "failed" if attempts >= MAX_ATTEMPTS else "running",
+                    "attempts": attempts,
+                    "error": str(e),
+                    "lease_owner": None,
+                    "lease_until": None,
+                    "updated_at": datetime.utcnow()
+                }}
+            )
+
+
+# Singleton instance
+cascade_runner = CascadeRunner()
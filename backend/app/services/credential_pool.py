@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Optional, Tuple
+from ..config import settings
+from ..utils.auth_utils import generate_temp_password, hash_password_async
+from ..utils.metrics import register_metrics_source
+
+logger = logging.getLogger(__name__)
+
+
+class CredentialPool:
+    """
+    Ready (temporary password, bcrypt hash) pairs, so creating a faculty
+    account or resending credentials does not wait for bcrypt. A background
+    task tops the pool up one hash at a time; take() falls back to hashing
+    inline when the pool is empty.
+
+    Pairs are held only in memory, handed out once, and dropped on shutdown.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._pairs: Deque[Tuple[str, str]] = deque()
+        self._taken = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+
+    async def start(self):
+        if self.capacity > 0:
+            self._task = asyncio.create_task(self._refill())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._pairs.clear()
+
+    async def take(self) -> Tuple[str, str]:
+        """A fresh (plaintext, hash) temporary credential pair"""
+        if self._pairs:
+            self.hits += 1
+            pair = self._pairs.popleft()
+        else:
+            self.misses += 1
+            password = generate_temp_password()
+            pair = (password, await hash_password_async(password))
+        self._taken.set()
+        return pair
+
+    async def _refill(self):
+        pause = settings.CREDENTIAL_POOL_REFILL_PAUSE_MS / 1000
+        while True:
+            if len(self._pairs) >= self.capacity:
+                self._taken.clear()
+                await self._taken.wait()
+                continue
+            try:
+                password = generate_temp_password()
+                self._pairs.append((password, await hash_password_async(password)))
+                self.generated += 1
+            except Exception as e:
+                logger.warning("Failed to pre-generate temporary credential", extra={"error": str(e)})
+            # One hash at a time with a gap between, so refilling stays in the background
+            await asyncio.sleep(pause)
+
+    def stats(self) -> dict:
+        taken = self.hits + self.misses
+        return {
+            "capacity": self.capacity,
+            "available": len(self._pairs),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / taken, 4) if taken else 0.0,
+            "generated": self.generated,
+        }
+
+
+# Singleton instance
+credential_pool = CredentialPool(settings.CREDENTIAL_POOL_SIZE)
+register_metrics_source("credential_pool", credential_pool.stats)
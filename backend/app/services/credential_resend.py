@@ -0,0 +1,184 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+from bson import ObjectId
+from pymongo import UpdateOne
+from ..config import settings
+from ..database.database import db
+from ..utils.auth_utils import generate_temp_password, get_temp_password_expiry, hash_password_async
+from .email_service import email_service, bulk_email_limiter
+from .cascade import JOBS_COLLECTION
+from .audit import audit_logger
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE = "credential_resend"
+
+def pending_setup_filter(department: Optional[str] = None, min_age_days: Optional[int] = None) -> dict:
+    """Faculty who never finished first-time setup, optionally narrowed down"""
+    # Documents not yet migrated may lack is_first_login, which defaults to True
+    query = {"role": "faculty", "is_first_login": {"$ne": False}}
+    if department:
+        query["department"] = department
+    if min_age_days:
+        query["created_at"] = {"$lte": datetime.utcnow() - timedelta(days=min_age_days)}
+    return query
+
+
+class CredentialResendRunner:
+    """
+    Sends fresh temporary credentials to pending-setup faculty in batches:
+    passwords are hashed on a bounded number of worker threads, each batch is
+    stored with one bulk_write, and emails go out through the shared bulk
+    rate limiter. Progress is kept in a background_jobs document.
+
+    Plaintext passwords only exist in memory, so an interrupted job is marked
+    failed rather than resumed; users it had not reached keep their old
+    credentials and a new job can be started.
+    """
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+        self._hash_slots = asyncio.Semaphore(settings.CREDENTIAL_RESEND_HASH_CONCURRENCY)
+
+    async def enqueue(self, query: dict, filters: dict, admin_id: str) -> dict:
+        """Record a resend job for the users matching `query` and start it"""
+        now = datetime.utcnow()
+        job = {
+            "type": JOB_TYPE,
+            "status": "pending",
+            "target_id": None,
+            "filters": filters,
+            "requested_by": admin_id,
+            "progress": {
+                "matched": await db.database["users"].count_documents(query),
+                "updated": 0,
+                "emailed": 0,
+                "failed": 0
+            },
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "completed_at": None
+        }
+        result = await db.database[JOBS_COLLECTION].insert_one(job)
+        job["_id"] = result.inserted_id
+
+        task = asyncio.create_task(self._run(result.inserted_id, query, admin_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def stop(self):
+        """Cancel running jobs; they are recorded as interrupted"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _hash(self, password: str) -> str:
+        async with self._hash_slots:
+            return await hash_password_async(password)
+
+    async def _send(self, user: dict, temp_password: str) -> bool:
+        return await bulk_email_limiter.send(
+            lambda: email_service.send_credentials_resend_email(
+                recipient_email=user["email"],
+                recipient_name=user["name"],
+                temp_password=temp_password
+            )
+        )
+
+    async def _process_batch(self, users: List[dict], query: dict) -> dict:
+        """New credentials for one batch of users; returns progress increments"""
+        users_collection = db.database["users"]
+        passwords = [generate_temp_password() for _ in users]
+        hashes = await asyncio.gather(*[self._hash(password) for password in passwords])
+
+        now = datetime.utcnow()
+        expiry = get_temp_password_expiry()
+        result = await users_collection.bulk_write(
+            [
+                # Skips anyone who completed setup since the batch was read
+                UpdateOne(
+                    {"_id": user["_id"], **query},
+                    {"$set": {"temp_password_hash": temp_hash, "temp_password_expiry": expiry, "updated_at": now}}
+                )
+                for user, temp_hash in zip(users, hashes)
+            ],
+            ordered=False
+        )
+
+        updated = list(zip(users, passwords))
+        if result.matched_count < len(users):
+            stored = {
+                doc["_id"]
+                async for doc in users_collection.find(
+                    {"_id": {"$in": [user["_id"] for user in users]}, "temp_password_hash": {"$in": hashes}},
+                    {"_id": 1}
+                )
+            }
+            updated = [(user, password) for user, password in updated if user["_id"] in stored]
+
+        sent = await asyncio.gather(
+            *[self._send(user, password) for user, password in updated],
+            return_exceptions=True
+        )
+        emailed = sum(1 for ok in sent if ok is True)
+        return {"updated": len(updated), "emailed": emailed, "failed": len(updated) - emailed}
+
+    async def _run(self, job_id: ObjectId, query: dict, admin_id: str):
+        jobs = db.database[JOBS_COLLECTION]
+        totals = {"updated": 0, "emailed": 0, "failed": 0}
+        await jobs.update_one({"_id": job_id}, {"$set": {"status": "running", "updated_at": datetime.utcnow()}})
+        try:
+            last_id = None
+            batch_size = settings.CREDENTIAL_RESEND_BATCH_SIZE
+            while True:
+                batch_query = query if last_id is None else {**query, "_id": {"$gt": last_id}}
+                users = await db.database["users"].find(
+                    batch_query, {"name": 1, "email": 1}
+                ).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+                if not users:
+                    break
+                last_id = users[-1]["_id"]
+
+                counts = await self._process_batch(users, query)
+                for name, count in counts.items():
+                    totals[name] += count
+                await jobs.update_one(
+                    {"_id": job_id},
+                    {
+                        "$inc": {f"progress.{name}": count for name, count in counts.items()},
+                        "$set": {"updated_at": datetime.utcnow()}
+                    }
+                )
+
+            now = datetime.utcnow()
+            await jobs.update_one(
+                {"_id": job_id},
+                {"$set": {"status": "completed", "updated_at": now, "completed_at": now}}
+            )
+            audit_logger.record(
+                "faculty.credentials_bulk_resent",
+                actor_id=admin_id,
+                target_id=str(job_id),
+                details=totals
+            )
+            logger.info("Credential resend completed", extra={"job_id": str(job_id), **totals})
+        except asyncio.CancelledError:
+            await asyncio.shield(self._fail(job_id, "Interrupted by shutdown; start a new job for the remaining users"))
+            raise
+        except Exception as e:
+            logger.exception("Credential resend failed", extra={"job_id": str(job_id)})
+            await self._fail(job_id, str(e))
+
+    async def _fail(self, job_id: ObjectId, error: str):
+        await db.database[JOBS_COLLECTION].update_one(
+            {"_id": job_id},
+            {"$set": {"status": "failed", "error": error, "updated_at": datetime.utcnow()}}
+        )
+
+
+# Singleton instance
+credential_resend_runner = CredentialResendRunner()
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from datetime import datetime
+from bson import ObjectId
+from ..config import settings
+from ..database.database import db
+from .email_service import email_service, bulk_email_limiter
+
+logger = logging.getLogger(__name__)
+
+def _pending_filter(cutoff: datetime) -> dict:
+    """
+    Unread notifications not yet included in a digest, up to the cutoff
+    Served by the (read, digested_at, created_at) index
+    """
+    return {"read": False, "digested_at": None, "created_at": {"$lte": cutoff}}
+
+async def _send_digest(recipient: dict, user: dict, cutoff: datetime) -> bool:
+    notifications = db.database["notifications"]
+    query = {"recipient_id": recipient["_id"], **_pending_filter(cutoff)}
+
+    async def send() -> bool:
+        latest = await notifications.find(
+            query,
+            {"title": 1, "message": 1, "created_at": 1}
+        ).sort("created_at", -1).limit(settings.NOTIFICATION_DIGEST_MAX_ITEMS).to_list(
+            length=settings.NOTIFICATION_DIGEST_MAX_ITEMS
+        )
+        if not latest:
+            return False
+        return await email_service.send_notification_digest_email(
+            recipient_email=user["email"],
+            recipient_name=user["name"],
+            notifications=latest,
+            total_count=recipient["count"]
+        )
+
+    # Shares the SMTP rate limit with bulk credential sends
+    if not await bulk_email_limiter.send(send):
+        return False  # left pending, retried on the next pass
+
+    # Everything up to the cutoff was summarised, including items beyond the listed ones
+    await notifications.update_many(query, {"$set": {"digested_at": datetime.utcnow()}})
+    return True
+
+async def send_notification_digests():
+    """Email each recipient one summary of their unread, not-yet-digested notifications"""
+    cutoff = datetime.utcnow()
+    recipients = await db.database["notifications"].aggregate([
+        {"$match": _pending_filter(cutoff)},
+        {"$group": {"_id": "$recipient_id", "count": {"$sum": 1}}}
+    ]).to_list(length=None)
+    if not recipients:
+        return
+
+    user_ids = [ObjectId(r["_id"]) for r in recipients if ObjectId.is_valid(r["_id"])]
+    users = {
+        str(user["_id"]): user
+        async for user in db.database["users"].find({"_id": {"$in": user_ids}}, {"name": 1, "email": 1})
+    }
+
+    results = await asyncio.gather(
+        *[
+            _send_digest(recipient, users[recipient["_id"]], cutoff)
+            for recipient in recipients
+            if recipient["_id"] in users
+        ],
+        return_exceptions=True
+    )
+
+    sent = sum(1 for result in results if result is True)
+    failed = sum(1 for result in results if isinstance(result, Exception))
+    logger.info(
+        "Notification digest sent",
+        extra={"sent": sent, "failed": failed, "recipients": len(recipients)}
+    )
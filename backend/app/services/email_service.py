@@ -1,13 +1,47 @@
 import asyncio
-from typing import Optional
+import logging
+from typing import Awaitable, Callable, List, Optional
 from datetime import datetime
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
+class SendRateLimiter:
+    """
+    Spaces sends evenly at `per_second` across every caller sharing the
+    limiter, with at most `max_concurrency` SMTP conversations open at once
+    """
+    
+    def __init__(self, per_second: float, max_concurrency: int):
+        self.interval = 1 / per_second if per_second > 0 else 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._next_slot = 0.0
+    
+    async def send(self, send: Callable[[], Awaitable[bool]]) -> bool:
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            now = loop.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            return await send()
+
 class EmailService:
     """Email service for sending notifications to users"""
     
-    def __init__(self):
-        self.use_mock = settings.USE_MOCK_EMAIL
+    def __init__(
+        self,
+        use_mock: Optional[bool] = None,
+        smtp_host: Optional[str] = None,
+        smtp_port: Optional[int] = None,
+        use_tls: Optional[bool] = None
+    ):
+        """SMTP options default to settings; overrides are used to point at a local sink"""
+        self.use_mock = settings.USE_MOCK_EMAIL if use_mock is None else use_mock
+        self.smtp_host = smtp_host or settings.SMTP_HOST
+        self.smtp_port = smtp_port or settings.SMTP_PORT
+        self.use_tls = settings.SMTP_USE_TLS if use_tls is None else use_tls
         
     async def send_welcome_email(
         self,
@@ -102,6 +136,39 @@ This temporary password will expire in {settings.TEMP_PASSWORD_EXPIRY_DAYS} days
 
 If you have already completed your setup, please ignore this email.
 
+Best regards,
+BMSIT Administration
+"""
+        
+        return await self._send_email(recipient_email, subject, body)
+    
+    async def send_notification_digest_email(
+        self,
+        recipient_email: str,
+        recipient_name: str,
+        notifications: List[dict],
+        total_count: int,
+        portal_url: str = "http://localhost:5173"
+    ) -> bool:
+        """Send one summary email covering a recipient's unread notifications"""
+        subject = f"BMSIT Faculty Portal - {total_count} unread notification{'s' if total_count != 1 else ''}"
+        
+        items = "\n".join(
+            f"- [{n['created_at']:%d %b %H:%M}] {n['title']}: {n['message']}"
+            for n in notifications
+        )
+        remaining = total_count - len(notifications)
+        more = f"\n...and {remaining} more.\n" if remaining > 0 else ""
+        
+        body = f"""
+Dear {recipient_name},
+
+You have {total_count} unread notification{'s' if total_count != 1 else ''} on the BMSIT Faculty Portal:
+
+{items}
+{more}
+Log in at {portal_url} to view them.
+
 Best regards,
 BMSIT Administration
 """
@@ -111,15 +178,12 @@ BMSIT Administration
     async def _send_email(self, to_email: str, subject: str, body: str) -> bool:
         """Internal method to send email (mock or real)"""
         if self.use_mock:
-            # Mock email service - just log to console
-            print("\n" + "="*80)
-            print("📧 MOCK EMAIL SERVICE")
-            print("="*80)
-            print(f"To: {to_email}")
-            print(f"Subject: {subject}")
-            print("-"*80)
-            print(body)
-            print("="*80 + "\n")
+            # Mock email service - one structured log record; the body
+            # (which may contain temporary passwords) only at DEBUG level
+            fields = {"to": to_email, "subject": subject, "body_chars": len(body)}
+            if logger.isEnabledFor(logging.DEBUG):
+                fields["body"] = body
+            logger.info("Mock email sent", extra=fields)
             return True
         else:
             # Real email service using SMTP
@@ -136,19 +200,20 @@ BMSIT Administration
                 
                 await aiosmtplib.send(
                     message,
-                    hostname=settings.SMTP_HOST,
-                    port=settings.SMTP_PORT,
+                    hostname=self.smtp_host,
+                    port=self.smtp_port,
                     username=settings.SMTP_USERNAME,
                     password=settings.SMTP_PASSWORD,
-                    use_tls=settings.SMTP_USE_TLS,
+                    use_tls=self.use_tls,
                 )
                 
-                print(f"✅ Email sent successfully to {to_email}")
+                logger.info("Email sent", extra={"to": to_email, "subject": subject})
                 return True
                 
             except Exception as e:
-                print(f"❌ Failed to send email to {to_email}: {str(e)}")
+                logger.error("Failed to send email", extra={"to": to_email, "subject": subject, "error": str(e)})
                 return False
 
-# Singleton instance
+# Singleton instances
 email_service = EmailService()
+bulk_email_limiter = SendRateLimiter(settings.BULK_EMAIL_PER_SECOND, settings.BULK_EMAIL_MAX_CONCURRENCY)
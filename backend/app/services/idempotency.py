@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from pymongo.errors import DuplicateKeyError
+from ..config import settings
+from ..database.database import db
+from ..utils.serialization import NegotiatedResponse
+
+IDEMPOTENCY_COLLECTION = "idempotency_keys"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL_SECONDS = 0.1
+
+# Requests currently executing in this process, by key, so local duplicates
+# wait on the first one instead of polling Mongo
+_in_flight: Dict[str, asyncio.Future] = {}
+
+def _fingerprint(payload: Any) -> str:
+    encoded = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def _replay(record: dict) -> NegotiatedResponse:
+    """Rebuild the stored response of a completed request"""
+    return NegotiatedResponse(
+        status_code=record["status_code"],
+        content=record["body"],
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+async def _claim_expired(doc_id: str, fingerprint: str) -> bool:
+    """Take over a pending key whose original request died without finishing"""
+    now = datetime.utcnow()
+    result = await db.database[IDEMPOTENCY_COLLECTION].update_one(
+        {"_id": doc_id, "status": "pending", "fingerprint": fingerprint, "locked_until": {"$lt": now}},
+        {"$set": {"locked_until": now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)}}
+    )
+    return result.modified_count == 1
+
+async def _wait_for_completion(doc_id: str, fingerprint: str) -> Tuple[Optional[dict], bool]:
+    """
+    Wait for a concurrent request with the same key to finish
+    Returns: (completed record or None, whether this request took over the key)
+    """
+    future = _in_flight.get(doc_id)
+    if future is not None:
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=settings.IDEMPOTENCY_WAIT_SECONDS)
+        except Exception:
+            pass
+
+    deadline = asyncio.get_running_loop().time() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        record = await db.database[IDEMPOTENCY_COLLECTION].find_one({"_id": doc_id})
+        if record is None:
+            # The first request failed and released the key
+            return None, False
+        if record["fingerprint"] != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request body"
+            )
+        if record["status"] == "completed":
+            return record, False
+        if await _claim_expired(doc_id, fingerprint):
+            return None, True
+        if asyncio.get_running_loop().time() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+                headers={"Retry-After": "1"}
+            )
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+async def _complete(doc_id: str, status_code: int, body: Any):
+    await db.database[IDEMPOTENCY_COLLECTION].update_one(
+        {"_id": doc_id},
+        {"$set": {"status": "completed", "status_code": status_code, "body": body}}
+    )
+
+async def run_idempotent(
+    idempotency_key: Optional[str],
+    scope: str,
+    payload: Any,
+    handler: Callable[[], Awaitable[Any]],
+    status_code: int = status.HTTP_200_OK
+) -> Any:
+    """
+    Execute a create handler at most once per Idempotency-Key.
+    The first response is stored; replays with the same key and body return it
+    without running the handler, and concurrent duplicates wait for the first.
+    """
+    if not idempotency_key:
+        return await handler()
+    if len(idempotency_key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"
+        )
+
+    doc_id = f"{scope}:{idempotency_key}"
+    fingerprint = _fingerprint(payload)
+    collection = db.database[IDEMPOTENCY_COLLECTION]
+
+    while True:
+        now = datetime.utcnow()
+        try:
+            await collection.insert_one({
+                "_id": doc_id,
+                "status": "pending",
+                "fingerprint": fingerprint,
+                "locked_until": now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+                "created_at": now
+            })
+            break
+        except DuplicateKeyError:
+            record, claimed = await _wait_for_completion(doc_id, fingerprint)
+            if record is not None:
+                return _replay(record)
+            if claimed:
+                break
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[doc_id] = future
+    try:
+        try:
+            result = await handler()
+        except HTTPException as e:
+            if e.status_code >= 500:
+                raise
+            # Client errors are deterministic for the same body, so replay them too
+            await _complete(doc_id, e.status_code, {"detail": e.detail})
+            raise
+        await _complete(doc_id, status_code, jsonable_encoder(result))
+        return result
+    except BaseException:
+        # Release the key so a retry can run the handler again
+        await collection.delete_one({"_id": doc_id, "status": "pending"})
+        raise
+    finally:
+        future.set_result(None)
+        _in_flight.pop(doc_id, None)
@@ -0,0 +1,57 @@
+import logging
+from datetime import datetime, timedelta
+from ..config import settings
+from ..database.database import db, ensure_indexes
+from .scheduler import scheduler
+from .cascade import cascade_runner
+from .digest import send_notification_digests
+from .notification_sync import record_deletions
+
+logger = logging.getLogger(__name__)
+
+PRUNE_BATCH_SIZE = 1000
+
+async def prune_read_notifications():
+    """Delete read notifications older than the retention period, leaving sync tombstones"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    notifications = db.database["notifications"]
+    deleted_count = 0
+    while True:
+        batch = await notifications.find(
+            {"read": True, "updated_at": {"$lt": cutoff}},
+            {"recipient_id": 1}
+        ).limit(PRUNE_BATCH_SIZE).to_list(length=PRUNE_BATCH_SIZE)
+        if not batch:
+            break
+        await record_deletions(batch)
+        result = await notifications.delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        deleted_count += result.deleted_count
+    if deleted_count:
+        logger.info("Pruned read notifications", extra={"deleted_count": deleted_count, "cutoff": cutoff.isoformat()})
+
+async def check_indexes():
+    """Recreate indexes dropped since startup created them"""
+    await ensure_indexes()
+
+async def resume_deletion_jobs():
+    """Pick up user-deletion cleanups interrupted by a crash or shutdown"""
+    await cascade_runner.resume_pending()
+
+def register_maintenance_jobs():
+    """Register periodic maintenance jobs with the scheduler"""
+    scheduler.add_interval_job("check_indexes", check_indexes, seconds=6 * 60 * 60, jitter_seconds=60)
+    scheduler.add_interval_job("resume_deletion_jobs", resume_deletion_jobs, seconds=60, jitter_seconds=5)
+    scheduler.add_cron_job(
+        "prune_read_notifications",
+        prune_read_notifications,
+        cron=settings.NOTIFICATION_PRUNE_CRON,
+        timeout_seconds=15 * 60
+    )
+    if settings.NOTIFICATION_DIGEST_ENABLED:
+        scheduler.add_interval_job(
+            "notification_digest",
+            send_notification_digests,
+            seconds=settings.NOTIFICATION_DIGEST_WINDOW_MINUTES * 60,
+            jitter_seconds=30,
+            timeout_seconds=30 * 60
+        )
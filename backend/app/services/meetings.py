@@ -0,0 +1,59 @@
+from typing import List
+from bson import ObjectId
+from ..database.database import db
+from .cascade import register_cascade_step
+
+MEETINGS_COLLECTION = "meetings"
+
+# Audience groups offered by the mobile app, as filters on the users collection
+# (served by the users (role, designation) index). Both the calendar and the
+# edit screen spellings are accepted.
+ATTENDEE_GROUPS = {
+    "All Faculty": {"role": "faculty"},
+    "All Associate Prof": {"role": "faculty", "designation": "Associate Professor"},
+    "Associate Professors": {"role": "faculty", "designation": "Associate Professor"},
+    "All Assistant Prof": {"role": "faculty", "designation": "Assistant Professor"},
+    "Assistant Professors": {"role": "faculty", "designation": "Assistant Professor"},
+    "HODs Only": {"role": "faculty", "designation": "HOD"},
+}
+
+# Meetings whose attendees are listed explicitly in custom_attendee_uids
+CUSTOM_GROUP = "Custom"
+
+async def expand_attendees(attendees: str, custom_attendee_uids: List[str], scheduled_by: str) -> List[str]:
+    """
+    Resolve a meeting's audience to user IDs
+    Group membership is captured when the meeting is saved; the scheduler
+    and any custom attendees are always included.
+    """
+    attendee_ids = set(custom_attendee_uids)
+    attendee_ids.add(scheduled_by)
+
+    group = ATTENDEE_GROUPS.get(attendees)
+    if group is not None:
+        async for user in db.database["users"].find(group, {"_id": 1}):
+            attendee_ids.add(str(user["_id"]))
+
+    return sorted(attendee_ids)
+
+async def missing_users(user_ids: List[str]) -> List[str]:
+    """IDs from the list that do not belong to an existing user"""
+    oids = [ObjectId(user_id) for user_id in user_ids if ObjectId.is_valid(user_id)]
+    existing = await db.database["users"].find({"_id": {"$in": oids}}, {"_id": 1}).to_list(length=None)
+    found = {str(user["_id"]) for user in existing}
+    return [user_id for user_id in user_ids if user_id not in found]
+
+async def _cascade_meetings(user_id: str, batch_size: int) -> int:
+    """Remove a deleted user from one batch of meeting attendee lists"""
+    meetings = db.database[MEETINGS_COLLECTION]
+    batch = await meetings.find({"attendee_ids": user_id}, {"_id": 1}).limit(batch_size).to_list(length=batch_size)
+    if not batch:
+        return 0
+
+    await meetings.update_many(
+        {"_id": {"$in": [doc["_id"] for doc in batch]}},
+        {"$pull": {"attendee_ids": user_id, "custom_attendee_uids": user_id}}
+    )
+    return len(batch)
+
+register_cascade_step("meetings", _cascade_meetings)
@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from bson import ObjectId
+
+# Every migrated document records the schema version it conforms to;
+# documents without the field are version 0
+VERSION_FIELD = "schema_version"
+
+# Returned by an upgrade for a field the new schema drops
+REMOVE = object()
+
+# An upgrade inspects a document at version - 1 and returns the fields to
+# change (value, or REMOVE). It must be pure: the same function backfills
+# documents in migrate.py and upgrades old documents in memory on read.
+Upgrade = Callable[[dict], Dict[str, Any]]
+
+
+class Migration:
+    """One schema step for a collection"""
+
+    def __init__(self, collection: str, version: int, description: str, upgrade: Upgrade):
+        self.collection = collection
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+
+
+MIGRATIONS: Dict[str, List[Migration]] = {}
+
+def register_migration(collection: str, version: int, description: str):
+    """Decorator adding the next schema version for a collection"""
+    def decorator(upgrade: Upgrade) -> Upgrade:
+        steps = MIGRATIONS.setdefault(collection, [])
+        if version != len(steps) + 1:
+            raise ValueError(f"{collection} migrations must be numbered consecutively; expected {len(steps) + 1}")
+        steps.append(Migration(collection, version, description, upgrade))
+        return upgrade
+    return decorator
+
+def current_version(collection: str) -> int:
+    """Schema version new documents in the collection are written with"""
+    return len(MIGRATIONS.get(collection, []))
+
+def document_version(doc: dict) -> int:
+    return doc.get(VERSION_FIELD, 0)
+
+def upgrade_changes(collection: str, doc: dict) -> Dict[str, Any]:
+    """Combined changes that bring a document to the current version"""
+    working = dict(doc)
+    changes: Dict[str, Any] = {}
+    for migration in MIGRATIONS.get(collection, [])[document_version(doc):]:
+        step = migration.upgrade(working)
+        for field, value in step.items():
+            if value is REMOVE:
+                working.pop(field, None)
+            else:
+                working[field] = value
+        changes.update(step)
+    if changes or document_version(doc) < current_version(collection):
+        changes[VERSION_FIELD] = current_version(collection)
+    return changes
+
+def upgrade_document(collection: str, doc: Optional[dict]) -> Optional[dict]:
+    """
+    A full document as the current schema sees it, so reads stay correct
+    while a migration is still backfilling the collection. Current documents
+    are returned as is (not copied); never pass projected documents, whose
+    missing fields would look like an old schema.
+    """
+    if doc is None or document_version(doc) >= current_version(collection):
+        return doc
+    upgraded = dict(doc)
+    for field, value in upgrade_changes(collection, doc).items():
+        if value is REMOVE:
+            upgraded.pop(field, None)
+        else:
+            upgraded[field] = value
+    return upgraded
+
+def new_document(collection: str, doc: dict) -> dict:
+    """
+    A document about to be inserted, completed with every field the
+    migrations guarantee and stamped with the current version. Fields the
+    caller set are kept.
+    """
+    return upgrade_document(collection, {**doc, VERSION_FIELD: 0})
+
+def _id_time(doc: dict) -> datetime:
+    """Creation time recorded in an ObjectId, as the naive UTC the app stores"""
+    if isinstance(doc.get("_id"), ObjectId):
+        return doc["_id"].generation_time.replace(tzinfo=None)
+    return datetime.utcnow()
+
+
+USER_DEFAULTS = {
+    "phone": None,
+    "employee_id": None,
+    "role": "faculty",
+    "bio": None,
+    "profile_picture": None,
+    "is_first_login": True,
+    "password_change_required": True,
+    "temp_password_hash": None,
+    "temp_password_expiry": None,
+    "email_verified": False,
+    "last_password_change": None,
+    "failed_login_attempts": 0,
+    "account_locked": False,
+}
+
+@register_migration("users", 1, "Store fields UserInDB used to default on every read")
+def _users_v1(doc: dict) -> Dict[str, Any]:
+    changes = {field: value for field, value in USER_DEFAULTS.items() if field not in doc}
+    if "created_at" not in doc:
+        changes["created_at"] = _id_time(doc)
+    if "updated_at" not in doc:
+        changes["updated_at"] = doc.get("created_at") or _id_time(doc)
+    return changes
+
+@register_migration("notifications", 1, "Store read flag and timestamps NotificationInDB used to default")
+def _notifications_v1(doc: dict) -> Dict[str, Any]:
+    changes = {}
+    if "read" not in doc:
+        changes["read"] = False
+    if "created_at" not in doc:
+        changes["created_at"] = _id_time(doc)
+    if "updated_at" not in doc:
+        # Delta sync keys off updated_at, so it must exist for every document
+        changes["updated_at"] = doc.get("created_at") or _id_time(doc)
+    if "digested_at" not in doc:
+        changes["digested_at"] = None
+    return changes
@@ -0,0 +1,49 @@
+import base64
+from datetime import datetime
+from typing import List, Tuple
+import bson
+from ..database.database import db
+
+TOMBSTONES_COLLECTION = "notification_tombstones"
+
+def encode_sync_cursor(started: datetime, last: dict) -> str:
+    """
+    Opaque position after `last` in a paged sync that began at `started`.
+    Pages are ordered by (updated_at, _id), so a notification changed while
+    the client is paging moves ahead of the cursor and is still delivered.
+    """
+    raw = bson.encode({"started": started, "updated_at": last.get("updated_at"), "id": last["_id"]})
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_sync_cursor(cursor: str) -> Tuple[datetime, datetime, bson.ObjectId]:
+    """(started, updated_at, _id) from encode_sync_cursor; ValueError if malformed"""
+    try:
+        state = bson.decode(base64.urlsafe_b64decode(cursor.encode()))
+        return state["started"], state["updated_at"], state["id"]
+    except Exception as e:
+        raise ValueError("Malformed sync cursor") from e
+
+async def record_deletions(notifications: List[dict], session=None):
+    """
+    Leave a tombstone for each notification about to be deleted so that
+    GET /notifications/sync can tell clients to drop it.
+    Documents need `_id` and `recipient_id`. Write the tombstones before
+    deleting: a sync that sees both the tombstone and the document still
+    drops it, whereas a crash between the two steps must not lose the delete.
+    """
+    if not notifications:
+        return
+
+    deleted_at = datetime.utcnow()
+    await db.database[TOMBSTONES_COLLECTION].insert_many(
+        [
+            {
+                "notification_id": str(doc["_id"]),
+                "recipient_id": doc.get("recipient_id"),
+                "deleted_at": deleted_at
+            }
+            for doc in notifications
+        ],
+        ordered=False,
+        session=session
+    )
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+from pymongo import ReturnDocument
+from ..config import settings
+from ..database.database import db
+from ..database.sessions import token_operation_time
+from ..utils.metrics import register_metrics_source
+
+logger = logging.getLogger(__name__)
+
+GENERATIONS_COLLECTION = "cache_generations"
+
+
+class GenerationCache:
+    """
+    Bounded LRU cache of query results for one collection.
+    Every entry is tagged with the collection's generation number at the time
+    it was read; writers bump the generation, which invalidates all entries.
+    The generation is shared through Mongo so writes on other workers are
+    picked up by a lightweight background poll.
+
+    `operation_time` is the cluster time at which the current generation was
+    observed. Queries that fill the cache must read at or after it, otherwise
+    a lagging secondary could cache pre-write results under the new generation.
+    """
+
+    def __init__(self, collection: str, max_entries: int):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.generation = 0
+        self.operation_time = None
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for key, or None if missing or from an older generation"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != self.generation:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: int):
+        """Store a value read while the cache was at `generation`"""
+        if generation != self.generation:
+            return  # a write happened while the query was running
+        self._entries[key] = (generation, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _advance(self, generation: int, operation_time=None):
+        if generation > self.generation:
+            self.generation = generation
+            self._entries.clear()
+        if generation == self.generation and operation_time is not None:
+            if self.operation_time is None or operation_time > self.operation_time:
+                self.operation_time = operation_time
+
+    async def bump(self, session=None):
+        """
+        Invalidate all entries here and, via Mongo, on every other worker
+        Pass the session the write was made on so cache fills read after it
+        """
+        self._advance(self.generation + 1, session.operation_time if session else None)
+        async with await db.client.start_session() as own_session:
+            doc = await db.database[GENERATIONS_COLLECTION].find_one_and_update(
+                {"_id": self.collection},
+                {"$inc": {"generation": 1}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+                session=own_session
+            )
+            self._advance(doc["generation"], own_session.operation_time)
+
+    async def refresh(self):
+        """Adopt the shared generation if another worker has bumped it"""
+        async with await db.client.start_session() as session:
+            doc = await db.database[GENERATIONS_COLLECTION].find_one({"_id": self.collection}, session=session)
+            self._advance(doc["generation"] if doc else 0, session.operation_time)
+
+    def stats(self) -> dict:
+        return {
+            "generation": self.generation,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    async def catch_up(self, session):
+        """
+        Make reads on a client's causal session consistent with this cache:
+        adopt a newer generation the client may have caused on another worker,
+        then make the session's own queries read no earlier than the generation.
+        Only a client whose previous request ended after the generation was
+        last observed (by the poller or a write here) can have caused a bump
+        this worker has not seen, so only then is Mongo read.
+        """
+        if session is None:
+            return
+        client_time = token_operation_time()
+        if client_time is not None and (self.operation_time is None or client_time > self.operation_time):
+            await self.refresh()
+        if self.operation_time is not None:
+            session.advance_operation_time(self.operation_time)
+
+
+class GenerationPoller:
+    """Keeps every registered cache in sync with the shared generation numbers"""
+
+    def __init__(self, caches: List[GenerationCache]):
+        self.caches = caches
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        for cache in self.caches:
+            await cache.refresh()
+        self._task = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(settings.CACHE_GENERATION_POLL_SECONDS)
+            for cache in self.caches:
+                try:
+                    await cache.refresh()
+                except Exception as e:
+                    logger.warning(
+                        "Failed to refresh cache generation",
+                        extra={"collection": cache.collection, "error": str(e)}
+                    )
+
+
+# Directory listings from GET /faculty/
+users_cache = GenerationCache("users", max_entries=settings.FACULTY_CACHE_MAX_ENTRIES)
+generation_poller = GenerationPoller([users_cache])
+register_metrics_source("users_cache", users_cache.stats)
@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from ..config import settings
+from ..database.database import db
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "scheduler_jobs"
+RUN_HISTORY_LENGTH = 20
+ACQUIRE_RETRY_SECONDS = 5  # minimum wait after losing the lease race
+
+
+class CronSchedule:
+    """Minimal 5-field cron expression (minute hour day-of-month month day-of-week)"""
+
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse_field(field, low, high)
+            for field, (low, high) in zip(fields, self.RANGES)
+        ]
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> set:
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_str = part.split("/", 1)
+                step = int(step_str)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_str, end_str = part.split("-", 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = end = int(part)
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Invalid cron field: {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        # Cron weekdays are 0=Sunday; Python's are 0=Monday
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.any_day:
+            return weekday_ok
+        if self.any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after the given time"""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 4)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+
+class ScheduledJob:
+    """A named background job with an interval or cron schedule"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[None]],
+        interval_seconds: Optional[float] = None,
+        cron: Optional[str] = None,
+        jitter_seconds: float = 0,
+        timeout_seconds: float = 300
+    ):
+        if (interval_seconds is None) == (cron is None):
+            raise ValueError("Specify exactly one of interval_seconds or cron")
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.cron = CronSchedule(cron) if cron else None
+        self.jitter_seconds = jitter_seconds
+        self.timeout_seconds = timeout_seconds
+
+    def next_run_after(self, when: datetime) -> datetime:
+        if self.cron:
+            return self.cron.next_after(when)
+        return when + timedelta(seconds=self.interval_seconds)
+
+
+class Scheduler:
+    """
+    Runs registered jobs in the background of every worker process.
+    A lease document per job in Mongo guarantees that each scheduled run
+    executes on exactly one worker across the cluster.
+    """
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    def add_interval_job(self, name: str, func, seconds: float, **options) -> ScheduledJob:
+        """Register a job that runs every `seconds` seconds"""
+        return self._add(ScheduledJob(name, func, interval_seconds=seconds, **options))
+
+    def add_cron_job(self, name: str, func, cron: str, **options) -> ScheduledJob:
+        """Register a job that runs on a cron schedule (UTC)"""
+        return self._add(ScheduledJob(name, func, cron=cron, **options))
+
+    def _add(self, job: ScheduledJob) -> ScheduledJob:
+        if job.name in self.jobs:
+            raise ValueError(f"Job already registered: {job.name}")
+        self.jobs[job.name] = job
+        return job
+
+    async def start(self):
+        """Start one polling loop per registered job"""
+        self._stopping.clear()
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._job_loop(job), name=f"scheduler:{job.name}"))
+        logger.info("Scheduler started", extra={"jobs": len(self.jobs), "worker": self.worker_id})
+
+    async def stop(self):
+        """Stop all job loops, cancelling runs still in progress"""
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _job_loop(self, job: ScheduledJob):
+        collection = db.database[JOBS_COLLECTION]
+        while not self._stopping.is_set():
+            try:
+                state = await collection.find_one({"_id": job.name}, {"next_run_at": 1})
+                now = datetime.utcnow()
+                due = state.get("next_run_at") if state else None
+                if due is None:
+                    due = now if job.interval_seconds else job.next_run_after(now)
+                delay = max((due - now).total_seconds(), 0) + random.uniform(0, job.jitter_seconds)
+                # Re-read the schedule at least every minute so a due time moved
+                # by another worker is picked up
+                if await self._sleep(min(delay, 60)) or delay > 60:
+                    continue
+                if await self._acquire(job):
+                    await self._run(job)
+                else:
+                    # Another worker holds the lease or already ran this slot;
+                    # wait for its lease instead of retrying in a tight loop
+                    await self._sleep(await self._lease_wait(job))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Scheduler loop error", extra={"job": job.name})
+                await self._sleep(30)
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep unless stopping; returns True if the scheduler is stopping"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _lease_wait(self, job: ScheduledJob) -> float:
+        """Seconds until the job's current lease expires, within [ACQUIRE_RETRY_SECONDS, 60]"""
+        state = await db.database[JOBS_COLLECTION].find_one({"_id": job.name}, {"lease_until": 1})
+        lease_until = state.get("lease_until") if state else None
+        remaining = (lease_until - datetime.utcnow()).total_seconds() if lease_until else 0
+        return min(max(remaining, ACQUIRE_RETRY_SECONDS), 60)
+
+    async def _acquire(self, job: ScheduledJob) -> bool:
+        """Take the job's lease if its run is due and no other worker holds it"""
+        now = datetime.utcnow()
+        lease_until = now + timedelta(seconds=job.timeout_seconds + 60)
+        try:
+            await db.database[JOBS_COLLECTION].find_one_and_update(
+                {
+                    "_id": job.name,
+                    "$and": [
+                        {"$or": [{"next_run_at": {"$lte": now}}, {"next_run_at": None}]},
+                        {"$or": [{"lease_until": {"$lte": now}}, {"lease_until": None}]}
+                    ]
+                },
+                {"$set": {"lease_owner": self.worker_id, "lease_until": lease_until}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return True
+        except DuplicateKeyError:
+            # The document exists but the filter did not match: not due, or leased elsewhere
+            return False
+
+    async def _run(self, job: ScheduledJob):
+        started_at = datetime.utcnow()
+        error = None
+        run_status = "success"
+        try:
+            await asyncio.wait_for(job.func(), timeout=job.timeout_seconds)
+        except asyncio.TimeoutError:
+            run_status = "timeout"
+            error = f"Job exceeded timeout of {job.timeout_seconds}s"
+        except asyncio.CancelledError:
+            await self._release(job, started_at, "cancelled", "Worker shut down during run")
+            raise
+        except Exception as e:
+            run_status = "failed"
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+
+        if error:
+            logger.error("Scheduled job did not succeed", extra={"job": job.name, "status": run_status, "error": error})
+        await self._release(job, started_at, run_status, error)
+
+    async def _release(self, job: ScheduledJob, started_at: datetime, run_status: str, error: Optional[str]):
+        """Record the run and hand the lease back with the next due time"""
+        finished_at = datetime.utcnow()
+        run = {
+            "worker": self.worker_id,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "duration_ms": round((finished_at - started_at).total_seconds() * 1000, 1),
+            "status": run_status,
+            "error": error
+        }
+        update = {
+            "$set": {
+                "next_run_at": job.next_run_after(started_at if job.interval_seconds else finished_at),
+                "lease_owner": None,
+                "lease_until": None,
+                "last_run": run
+            },
+            "$inc": {"run_count": 1, "failure_count": 0 if run_status == "success" else 1},
+            "$push": {"history": {"$each": [run], "$slice": -RUN_HISTORY_LENGTH}}
+        }
+        if run_status != "success":
+            update["$set"]["last_error_at"] = finished_at
+        await db.database[JOBS_COLLECTION].update_one(
+            {"_id": job.name, "lease_owner": self.worker_id},
+            update
+        )
+
+
+# Singleton instance
+scheduler = Scheduler()
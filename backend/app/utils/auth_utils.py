@@ -3,11 +3,16 @@ import string
 from datetime import datetime, timedelta
 from typing import Optional
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 from jose import JWTError, jwt
 from ..config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context; hashes with a different cost report needs_update()
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
@@ -17,6 +22,18 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
 
+async def hash_password_async(password: str) -> str:
+    """hash_password() on a worker thread, so the event loop keeps serving other requests"""
+    return await run_in_threadpool(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() on a worker thread"""
+    return await run_in_threadpool(verify_password, plain_password, hashed_password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash was created with an outdated scheme or cost"""
+    return pwd_context.needs_update(hashed_password)
+
 def generate_temp_password(length: int = 12) -> str:
     """Generate a secure random temporary password"""
     # Ensure password has at least one of each required character type
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Dict, List, Optional
+from ..config import settings
+from .metrics import register_metrics_source
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STACK_DEPTH = 12
+
+
+def _describe(frame: traceback.FrameSummary) -> str:
+    path = frame.filename
+    if path.startswith(APP_DIR):
+        path = os.path.relpath(path, os.path.dirname(APP_DIR))
+    elif "site-packages" + os.sep in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    else:
+        path = os.path.basename(path)
+    return f"{path}:{frame.lineno} in {frame.name}"
+
+
+class LoopWatchdog:
+    """
+    Detects event-loop stalls. A heartbeat task wakes every
+    LOOP_WATCHDOG_INTERVAL_MS and records how late it woke (loop lag). A helper
+    thread watches the heartbeat; when the loop has been blocked longer than
+    LOOP_STALL_THRESHOLD_MS it captures the loop thread's stack while the
+    blocking code is still running. Stalls are aggregated by the innermost
+    frame in app code, i.e. where the app called into the blocking work; the
+    sampled stack shows the library frames below it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._captured: Optional[dict] = None  # stack of the stall in progress
+        self.samples = 0
+        self.total_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.stalls = 0
+        self.locations: Dict[str, dict] = {}
+        self.dropped_locations = 0
+
+    async def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    async def _heartbeat(self):
+        interval = settings.LOOP_WATCHDOG_INTERVAL_MS / 1000
+        while True:
+            beat = self._last_beat
+            expected = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            self._last_beat = now
+            self._record_lag(max(now - expected, 0) * 1000, beat)
+
+    def _watch(self):
+        """Helper thread: sample the loop thread's stack while it is stalled"""
+        threshold = settings.LOOP_STALL_THRESHOLD_MS / 1000
+        interval = settings.LOOP_WATCHDOG_INTERVAL_MS / 1000
+        while not self._stopping.wait(min(interval, threshold) / 2):
+            beat = self._last_beat
+            blocked = time.monotonic() - beat - interval
+            if blocked < threshold or self._captured is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            app_frames = [f for f in stack if f.filename.startswith(APP_DIR) and f.filename != __file__]
+            self._captured = {
+                "beat": beat,
+                "location": _describe(app_frames[-1]) if app_frames else "outside app code",
+                "blocking_frame": _describe(stack[-1]) if stack else "unknown",
+                "stack": [_describe(f) for f in stack[-STACK_DEPTH:]],
+            }
+
+    def _record_lag(self, lag_ms: float, beat: float):
+        with self._lock:
+            self.samples += 1
+            self.total_lag_ms += lag_ms
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            captured, self._captured = self._captured, None
+            if lag_ms < settings.LOOP_STALL_THRESHOLD_MS:
+                return
+            if captured is not None and captured["beat"] != beat:
+                captured = None  # taken as the loop resumed from an earlier stall
+            self.stalls += 1
+            captured = captured or {"location": "not captured", "blocking_frame": "unknown", "stack": []}
+            entry = self.locations.get(captured["location"])
+            if entry is None:
+                if len(self.locations) >= settings.LOOP_STALL_MAX_LOCATIONS:
+                    self.dropped_locations += 1
+                    return
+                entry = self.locations[captured["location"]] = {
+                    "location": captured["location"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "first_seen": datetime.utcnow(),
+                }
+            entry["count"] += 1
+            entry["total_ms"] += lag_ms
+            entry["max_ms"] = max(entry["max_ms"], lag_ms)
+            entry["last_seen"] = datetime.utcnow()
+            entry["blocking_frame"] = captured["blocking_frame"]
+            entry["stack"] = captured["stack"]
+        logger.warning(
+            "Event loop stalled",
+            extra={"lag_ms": round(lag_ms, 1), "location": captured["location"], "blocking_frame": captured["blocking_frame"]}
+        )
+
+    def worst(self, limit: int, sort: str = "total_ms") -> List[dict]:
+        """Stall locations, worst first by total_ms, max_ms or count"""
+        with self._lock:
+            entries = [dict(entry) for entry in self.locations.values()]
+        for entry in entries:
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 1)
+            entry["total_ms"] = round(entry["total_ms"], 1)
+            entry["max_ms"] = round(entry["max_ms"], 1)
+        entries.sort(key=lambda entry: entry[sort], reverse=True)
+        return entries[:limit]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "threshold_ms": settings.LOOP_STALL_THRESHOLD_MS,
+                "samples": self.samples,
+                "avg_lag_ms": round(self.total_lag_ms / self.samples, 2) if self.samples else 0.0,
+                "max_lag_ms": round(self.max_lag_ms, 1),
+                "stalls": self.stalls,
+                "stall_locations": len(self.locations),
+                "dropped_locations": self.dropped_locations,
+            }
+
+
+# Singleton instance
+loop_watchdog = LoopWatchdog()
+register_metrics_source("event_loop", loop_watchdog.stats)
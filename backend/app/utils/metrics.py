@@ -0,0 +1,20 @@
+from typing import Callable, Dict
+
+# A metrics source returns a JSON-serialisable snapshot of its counters
+MetricsSource = Callable[[], dict]
+
+_sources: Dict[str, MetricsSource] = {}
+
+def register_metrics_source(name: str, source: MetricsSource):
+    """Expose a component's counters under `name` in GET /admin/metrics"""
+    _sources[name] = source
+
+def collect_metrics() -> Dict[str, dict]:
+    """Snapshot every registered source; one failing source does not hide the rest"""
+    snapshot = {}
+    for name, source in _sources.items():
+        try:
+            snapshot[name] = source()
+        except Exception as e:
+            snapshot[name] = {"error": str(e)}
+    return snapshot
@@ -0,0 +1,62 @@
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Any
+import msgpack
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# Media type the current request negotiated, set by ContentNegotiationMiddleware
+response_media_type: ContextVar[str] = ContextVar("response_media_type", default=JSON_MEDIA_TYPE)
+
+
+def encode_default(obj: Any) -> Any:
+    """
+    Encoding for the BSON types responses carry, matching their JSON form:
+    ObjectIds as hex strings, datetimes in ISO 8601
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def packb(content: Any) -> bytes:
+    return msgpack.packb(content, default=encode_default, use_bin_type=True)
+
+
+def negotiate_media_type(accept: str) -> str:
+    """
+    MessagePack when the Accept header ranks it at least as high as JSON,
+    otherwise JSON (also for a missing or wildcard Accept)
+    """
+    msgpack_q = json_q = 0.0
+    for part in accept.split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        media_type = media_type.lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, quality)
+        elif media_type == JSON_MEDIA_TYPE:
+            json_q = max(json_q, quality)
+    return MSGPACK_MEDIA_TYPE if msgpack_q > 0 and msgpack_q >= json_q else JSON_MEDIA_TYPE
+
+
+class NegotiatedResponse(JSONResponse):
+    """JSONResponse that renders MessagePack instead when the request negotiated it"""
+
+    def render(self, content: Any) -> bytes:
+        if response_media_type.get() == MSGPACK_MEDIA_TYPE:
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return packb(content)
+        return super().render(content)
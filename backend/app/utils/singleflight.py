@@ -0,0 +1,82 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorClientSession
+from ..database.sessions import fork_session
+from .metrics import register_metrics_source
+
+_groups: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent reads: while a call for a key is in flight,
+    further calls with the same key await its result instead of querying again.
+
+    Pass the caller's causal session to keep coalescing causally safe. A
+    caller only joins a flight that reads at or after its session's
+    operation_time, so a client never receives a result older than its own
+    last write. The flight outlives the request that started it, and that
+    session is ended with its request, so the query runs on a session of its
+    own forked from the caller's and is handed that session.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, Tuple[asyncio.Task, Any]] = {}
+        self.calls = 0
+        self.coalesced = 0
+        _groups[name] = self
+
+    @staticmethod
+    def _can_join(read_after, flight_read_after) -> bool:
+        if read_after is None:
+            return True
+        return flight_read_after is not None and read_after <= flight_read_after
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[Optional[AsyncIOMotorClientSession]], Awaitable[Any]],
+        session: Optional[AsyncIOMotorClientSession] = None
+    ) -> Any:
+        self.calls += 1
+        read_after = session.operation_time if session else None
+        flight = self._in_flight.get(key)
+        if flight is not None and self._can_join(read_after, flight[1]):
+            self.coalesced += 1
+            task = flight[0]
+        else:
+            # The query runs in its own task, so one caller going away does
+            # not cancel it for the others
+            task = asyncio.ensure_future(self._run(func, session))
+            self._in_flight[key] = (task, read_after)
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _run(func, session):
+        if session is None:
+            return await func(None)
+        flight_session = await fork_session(session)
+        try:
+            return await func(flight_session)
+        finally:
+            await flight_session.end_session()
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        flight = self._in_flight.get(key)
+        if flight is not None and flight[0] is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller has gone
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalescing_rate": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            "in_flight": len(self._in_flight),
+        }
+
+
+register_metrics_source("singleflight", lambda: {name: group.stats() for name, group in _groups.items()})
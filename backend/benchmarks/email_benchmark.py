@@ -0,0 +1,64 @@
+"""
+Email throughput benchmark
+Sends welcome emails through EmailService._send_email (real SMTP path)
+into the local SMTP sink and reports messages/sec and latency percentiles.
+
+Run from the backend directory:
+    python -m benchmarks.email_benchmark --messages 1000 --concurrency 20 --latency-ms 10
+"""
+import argparse
+import asyncio
+import logging
+import time
+from app.services.email_service import EmailService
+from benchmarks.smtp_sink import SMTPSink
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+async def run(args):
+    # Per-message failure logs would dominate the output; failures are counted below
+    logging.getLogger("app.services.email_service").setLevel(logging.CRITICAL)
+    async with SMTPSink(latency_ms=args.latency_ms, failure_rate=args.failure_rate, seed=1) as sink:
+        service = EmailService(use_mock=False, smtp_host=sink.host, smtp_port=sink.port, use_tls=False)
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+        failures = 0
+
+        async def send_one(i: int):
+            nonlocal failures
+            async with semaphore:
+                start = time.perf_counter()
+                ok = await service.send_welcome_email(
+                    recipient_email=f"faculty{i}@bmsit.in",
+                    recipient_name=f"Faculty {i}",
+                    temp_password="Temp@12345"
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                if not ok:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[send_one(i) for i in range(args.messages)])
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        print(f"Messages:        {args.messages} (concurrency {args.concurrency})")
+        print(f"Sink latency:    {args.latency_ms} ms, failure rate {args.failure_rate}")
+        print(f"Elapsed:         {elapsed:.2f} s")
+        print(f"Throughput:      {args.messages / elapsed:,.1f} messages/sec")
+        print(f"Latency (ms):    p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} "
+              f"p99={percentile(latencies, 99):.1f} max={latencies[-1]:.1f}")
+        print(f"Failures:        {failures} reported, {sink.failures} injected")
+        print(f"Sink received:   {len(sink.messages)} messages over {sink.connections} connections")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark EmailService against a local SMTP sink")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    asyncio.run(run(parser.parse_args()))
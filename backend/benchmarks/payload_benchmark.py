@@ -0,0 +1,103 @@
+"""
+Response payload benchmark
+Compares JSON (as JSONResponse renders it) with MessagePack (as
+NegotiatedResponse renders it for Accept: application/msgpack) on synthetic
+GET /faculty/ and GET /notifications/ pages: body size, gzipped size, and
+encode/decode time per page.
+
+Run from the backend directory:
+    python -m benchmarks.payload_benchmark --rows 100 500 1000 --repeat 200
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+import msgpack
+from fastapi.encoders import jsonable_encoder
+from app.utils.serialization import packb
+
+DEPARTMENTS = ["CSE", "ISE", "ECE", "EEE", "MECH", "CIVIL"]
+DESIGNATIONS = ["Professor", "Associate Professor", "Assistant Professor"]
+
+def faculty_rows(count: int, rng: random.Random) -> list:
+    """Shaped like UserResponse items from GET /faculty/"""
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": str(ObjectId()),
+            "name": f"Faculty Member {i}",
+            "email": f"faculty{i}@bmsit.in",
+            "phone": f"+91 98{rng.randrange(10**8):08d}",
+            "department": rng.choice(DEPARTMENTS),
+            "designation": rng.choice(DESIGNATIONS),
+            "employee_id": f"BMSIT{i:05d}",
+            "role": "faculty",
+            "bio": None,
+            "profile_picture": None,
+            "is_first_login": rng.random() < 0.1,
+            "password_change_required": False,
+            "email_verified": True,
+            "last_password_change": now - timedelta(days=rng.randrange(365)),
+            "created_at": now - timedelta(days=rng.randrange(1000)),
+        }
+        for i in range(count)
+    ]
+
+def notification_rows(count: int, rng: random.Random) -> list:
+    """Shaped like the notifications returned by GET /notifications/"""
+    now = datetime.utcnow()
+    recipient = str(ObjectId())
+    return [
+        {
+            "_id": str(ObjectId()),
+            "title": f"Meeting scheduled #{i}",
+            "message": "Department meeting in the seminar hall. Please bring the semester plan.",
+            "type": rng.choice(["info", "success", "warning", "error"]),
+            "recipient_id": recipient,
+            "read": rng.random() < 0.5,
+            "created_at": now - timedelta(minutes=rng.randrange(100000)),
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+def render_json(content) -> bytes:
+    # Same settings as starlette's JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def timed(func, arg, repeat: int) -> float:
+    """Mean milliseconds per call"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(arg)
+    return (time.perf_counter() - started) / repeat * 1000
+
+def run(args):
+    rng = random.Random(1)
+    scenarios = [("faculty", faculty_rows), ("notifications", notification_rows)]
+    print(f"{'scenario':<20}{'format':<10}{'bytes':>10}{'gzip':>10}{'encode ms':>12}{'decode ms':>12}")
+    for name, build in scenarios:
+        for rows in args.rows:
+            # Routes return jsonable_encoder output, so both formats see the same content
+            content = jsonable_encoder(build(rows, rng))
+            results = {}
+            for fmt, encode, decode in (
+                ("json", render_json, json.loads),
+                ("msgpack", packb, msgpack.unpackb),
+            ):
+                body = encode(content)
+                results[fmt] = len(body)
+                print(
+                    f"{f'{name} x{rows}':<20}{fmt:<10}{len(body):>10,}{len(gzip.compress(body)):>10,}"
+                    f"{timed(encode, content, args.repeat):>12.3f}{timed(decode, body, args.repeat):>12.3f}"
+                )
+            print(f"{'':<20}msgpack is {results['msgpack'] / results['json']:.0%} of the JSON size")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare JSON and MessagePack response payloads")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=100)
+    run(parser.parse_args())
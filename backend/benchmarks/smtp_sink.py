@@ -0,0 +1,155 @@
+"""
+In-process asyncio SMTP sink for tests and benchmarks
+Accepts and records messages without delivering them, with optional
+per-message latency and random failure injection.
+
+CLI (from the backend directory):
+    python -m benchmarks.smtp_sink --port 2525 --latency-ms 20 --failure-rate 0.01
+
+In code:
+    sink = SMTPSink(latency_ms=5)
+    port = await sink.start()
+    ...
+    await sink.stop()
+"""
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class ReceivedMessage:
+    mail_from: str
+    rcpt_to: List[str]
+    data: bytes
+    received_at: float = field(default_factory=time.time)
+
+class SMTPSink:
+    """Minimal SMTP server implementing EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP and QUIT"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.messages: List[ReceivedMessage] = []
+        self.failures = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> int:
+        """Start listening; returns the bound port (useful with port=0)"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+
+        async def reply(line: str):
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        mail_from, rcpt_to = None, []
+        try:
+            await reply("220 localhost SMTP sink ready")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("latin-1").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    writer.write(b"250-localhost\r\n250-PIPELINING\r\n250-8BITMIME\r\n250 SIZE 26214400\r\n")
+                    await writer.drain()
+                elif verb == "HELO":
+                    await reply("250 localhost")
+                elif verb == "MAIL":
+                    mail_from, rcpt_to = command[10:].strip(), []
+                    await reply("250 2.1.0 OK")
+                elif verb == "RCPT":
+                    rcpt_to.append(command[8:].strip())
+                    await reply("250 2.1.5 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    data = await self._read_data(reader)
+                    if self.latency_ms:
+                        await asyncio.sleep(self.latency_ms / 1000)
+                    if self.failure_rate and self._random.random() < self.failure_rate:
+                        self.failures += 1
+                        await reply("451 4.3.0 Injected failure")
+                    else:
+                        self.messages.append(ReceivedMessage(mail_from or "", rcpt_to, data))
+                        await reply("250 2.0.0 OK queued")
+                    mail_from, rcpt_to = None, []
+                elif verb == "RSET":
+                    mail_from, rcpt_to = None, []
+                    await reply("250 2.0.0 OK")
+                elif verb == "NOOP":
+                    await reply("250 2.0.0 OK")
+                elif verb == "QUIT":
+                    await reply("221 2.0.0 Bye")
+                    break
+                else:
+                    await reply("502 5.5.2 Command not implemented")
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_data(reader: asyncio.StreamReader) -> bytes:
+        lines = []
+        while True:
+            line = await reader.readline()
+            if line in (b".\r\n", b".\n", b""):
+                break
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+async def _serve(args):
+    sink = SMTPSink(args.host, args.port, args.latency_ms, args.failure_rate)
+    port = await sink.start()
+    print(f"SMTP sink listening on {args.host}:{port} (latency={args.latency_ms}ms, failure_rate={args.failure_rate})")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"   received={len(sink.messages)} failed={sink.failures} connections={sink.connections}")
+    finally:
+        await sink.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local SMTP sink")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
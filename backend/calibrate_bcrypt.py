@@ -0,0 +1,55 @@
+"""
+Script to calibrate the bcrypt cost (BCRYPT_ROUNDS) for this hardware
+Measures password verification time per cost factor and recommends the
+highest cost whose median verification stays within the target latency.
+
+Usage:
+    python calibrate_bcrypt.py --target-ms 250
+
+Existing hashes are upgraded to the new cost on each user's next successful login.
+"""
+import argparse
+import statistics
+import time
+from passlib.context import CryptContext
+
+def measure(rounds: int, samples: int) -> float:
+    """Median verification time in milliseconds at the given cost"""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    password = "Calibrate@123"
+    hashed = context.hash(password)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.verify(password, hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick a bcrypt cost for a target verification latency")
+    parser.add_argument("--target-ms", type=float, default=250, help="Maximum median verification time")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=15)
+    parser.add_argument("--samples", type=int, default=5, help="Verifications timed per cost")
+    args = parser.parse_args()
+
+    print(f"Target: {args.target_ms:.0f} ms per verification\n")
+    print(f"{'rounds':>6}  {'median ms':>10}")
+
+    chosen = None
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        median_ms = measure(rounds, args.samples)
+        within = median_ms <= args.target_ms
+        print(f"{rounds:>6}  {median_ms:>10.1f}  {'✅' if within else '❌'}")
+        if within:
+            chosen = rounds
+        else:
+            break  # each extra round doubles the cost
+
+    if chosen is None:
+        print(f"\n⚠️  Even {args.min_rounds} rounds exceeds the target; using it anyway is not recommended")
+        chosen = args.min_rounds
+    print(f"\nRecommended setting (add to .env):\nBCRYPT_ROUNDS={chosen}")
+
+if __name__ == "__main__":
+    main()
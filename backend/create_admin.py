@@ -7,6 +7,7 @@ from passlib.context import CryptContext
 from datetime import datetime
 
 from app.config import settings
+from app.services.migrations import VERSION_FIELD, current_version
 
 # Configuration from settings
 MONGODB_URL = settings.MONGODB_URL
@@ -58,7 +59,8 @@ def create_admin():
             "failed_login_attempts": 0,
             "account_locked": False,
             "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "updated_at": datetime.utcnow(),
+            VERSION_FIELD: current_version("users")
         }
         
         result = db.users.insert_one(admin_user)
@@ -0,0 +1,216 @@
+"""
+Online schema migrations
+Brings documents up to the current schema_version (see app/services/migrations.py)
+in small, rate-limited batches while the API keeps serving. Progress is stored
+in the schema_migrations collection, so an interrupted run resumes where it
+stopped; the API upgrades not-yet-migrated documents in memory on read.
+
+Examples:
+    python migrate.py status
+    python migrate.py run
+    python migrate.py run --collection notifications --batch-size 200 --max-rate 500
+"""
+import argparse
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+
+from app.config import settings
+from app.services.migrations import (
+    MIGRATIONS, REMOVE, VERSION_FIELD, current_version, upgrade_changes
+)
+
+PROGRESS_COLLECTION = "schema_migrations"
+LEASE_SECONDS = 120
+MAX_PASSES = 5  # documents changed by the API mid-batch are retried on the next pass
+
+def outdated_filter(collection: str) -> dict:
+    return {"$or": [
+        {VERSION_FIELD: {"$exists": False}},
+        {VERSION_FIELD: {"$lt": current_version(collection)}}
+    ]}
+
+def guarded_update(doc: dict, changes: dict) -> UpdateOne:
+    """
+    Update a document only if the fields being changed still hold the values
+    the upgrade saw, so a concurrent API write is never overwritten
+    """
+    guard = {"_id": doc["_id"]}
+    for field in changes:  # includes VERSION_FIELD
+        guard[field] = doc[field] if field in doc else {"$exists": False}
+    update = {"$set": {k: v for k, v in changes.items() if v is not REMOVE}}
+    removed = {k: "" for k, v in changes.items() if v is REMOVE}
+    if removed:
+        update["$unset"] = removed
+    return UpdateOne(guard, update)
+
+def acquire_lease(progress, collection: str, owner: str) -> dict:
+    now = datetime.utcnow()
+    progress.update_one(
+        {"_id": collection},
+        {"$setOnInsert": {"processed": 0, "last_id": None, "pass": 1, "started_at": now}},
+        upsert=True
+    )
+    return progress.find_one_and_update(
+        {
+            "_id": collection,
+            "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}, {"lease_owner": owner}]
+        },
+        {"$set": {
+            "target_version": current_version(collection),
+            "status": "running",
+            "lease_owner": owner,
+            "lease_until": now + timedelta(seconds=LEASE_SECONDS),
+            "updated_at": now
+        }},
+        return_document=ReturnDocument.AFTER
+    )
+
+def run_collection(database, collection: str, batch_size: int, max_rate: float, owner: str):
+    target = current_version(collection)
+    documents = database[collection]
+    progress = database[PROGRESS_COLLECTION]
+
+    state = acquire_lease(progress, collection, owner)
+    if state is None:
+        print(f"⏸️  {collection}: another migration run holds the lease, skipping")
+        return
+
+    processed = state.get("processed", 0)
+    last_id = state.get("last_id")
+    current_pass = state.get("pass", 1)
+    remaining = documents.count_documents(outdated_filter(collection))
+    total = processed + remaining
+    resume_note = f" (resuming after {processed:,})" if processed else ""
+    print(f"\n🔧 {collection}: {remaining:,} documents below v{target}{resume_note}")
+
+    started = time.perf_counter()
+    migrated_this_run = 0
+    finished = False
+    try:
+        while True:
+            query = outdated_filter(collection)
+            if last_id is not None:
+                query = {"$and": [query, {"_id": {"$gt": last_id}}]}
+            batch = list(documents.find(query).sort("_id", 1).limit(batch_size))
+
+            if not batch:
+                left = documents.count_documents(outdated_filter(collection))
+                if left == 0 or current_pass >= MAX_PASSES:
+                    break
+                # Documents skipped because the API changed them mid-batch
+                current_pass += 1
+                last_id = None
+                print(f"\n   pass {current_pass}: retrying {left:,} documents changed during the previous pass")
+                continue
+
+            operations = [guarded_update(doc, upgrade_changes(collection, doc)) for doc in batch]
+            result = documents.bulk_write(operations, ordered=False)
+            processed += result.modified_count
+            migrated_this_run += result.modified_count
+            last_id = batch[-1]["_id"]
+
+            now = datetime.utcnow()
+            progress.update_one(
+                {"_id": collection, "lease_owner": owner},
+                {"$set": {
+                    "processed": processed,
+                    "last_id": last_id,
+                    "pass": current_pass,
+                    "lease_until": now + timedelta(seconds=LEASE_SECONDS),
+                    "updated_at": now
+                }}
+            )
+
+            elapsed = time.perf_counter() - started
+            rate = migrated_this_run / elapsed if elapsed > 0 else 0
+            percent = processed / total * 100 if total else 100
+            print(f"   {collection}: {processed:,}/{total:,} ({percent:.1f}%) at {rate:,.0f} docs/sec", end="\r")
+
+            # Throttle to max_rate documents per second
+            if max_rate:
+                ahead = migrated_this_run / max_rate - elapsed
+                if ahead > 0:
+                    time.sleep(ahead)
+        finished = True
+    finally:
+        left = documents.count_documents(outdated_filter(collection)) if finished else None
+        done = left == 0
+        update = {
+            "status": "completed" if done else ("incomplete" if finished else "paused"),
+            "lease_owner": None,
+            "lease_until": None,
+            "updated_at": datetime.utcnow()
+        }
+        if finished:
+            # A completed or exhausted run starts from scratch next time
+            update.update({"processed": 0, "last_id": None, "pass": 1})
+        if done:
+            update["completed_at"] = datetime.utcnow()
+        progress.update_one({"_id": collection, "lease_owner": owner}, {"$set": update})
+        print()
+
+    if done:
+        print(f"✅ {collection}: migrated {migrated_this_run:,} documents to v{target} "
+              f"in {time.perf_counter() - started:.1f}s")
+    else:
+        print(f"⚠️  {collection}: {left:,} documents still below v{target}; run again")
+
+def show_status(database):
+    for collection, migrations in MIGRATIONS.items():
+        target = current_version(collection)
+        print(f"\n📦 {collection} (current schema v{target})")
+        for migration in migrations:
+            print(f"   v{migration.version}: {migration.description}")
+        versions = database[collection].aggregate([
+            {"$group": {"_id": {"$ifNull": [f"${VERSION_FIELD}", 0]}, "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}}
+        ])
+        for row in versions:
+            marker = "" if row["_id"] >= target else "  ← needs migration"
+            print(f"   documents at v{row['_id']}: {row['count']:,}{marker}")
+        state = database[PROGRESS_COLLECTION].find_one({"_id": collection})
+        if state:
+            print(f"   last run: {state.get('status')} (updated {state.get('updated_at')})")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run online schema migrations")
+    parser.add_argument("command", choices=["status", "run"])
+    parser.add_argument("--collection", choices=sorted(MIGRATIONS), help="Only migrate this collection")
+    parser.add_argument("--batch-size", type=int, default=settings.MIGRATION_BATCH_SIZE)
+    parser.add_argument("--max-rate", type=float, default=settings.MIGRATION_MAX_DOCS_PER_SECOND,
+                        help="Documents per second (0 = unthrottled)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    client = MongoClient(settings.MONGODB_URL, serverSelectionTimeoutMS=5000)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    try:
+        client.server_info()
+        print(f"✅ Connected to MongoDB ({settings.MONGODB_DATABASE})")
+        database = client[settings.MONGODB_DATABASE]
+
+        if args.command == "status":
+            show_status(database)
+            return
+
+        for collection in ([args.collection] if args.collection else list(MIGRATIONS)):
+            run_collection(database, collection, args.batch_size, args.max_rate, owner)
+
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted; run again to resume")
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("BMSIT Faculty Portal - Schema Migrations")
+    print("=" * 60)
+    main()
+    print("=" * 60)
@@ -1,5 +1,56 @@
+"""
+Backend server launcher
+
+Development (auto-reload, single process):
+    python run.py --dev
+
+Production (multi-worker, uvloop/httptools when installed):
+    python run.py --workers 4
+
+Defaults come from the SERVER_* settings in app/config.py and can be
+overridden on the command line.
+"""
+import argparse
 import uvicorn
-from app.main import app
+from app.config import settings
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the BMSIT Faculty Portal API server")
+    parser.add_argument("--dev", action="store_true", help="Single process with auto-reload on 127.0.0.1")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument("--loop", default=settings.SERVER_LOOP, help="auto, asyncio or uvloop")
+    parser.add_argument("--http", default=settings.SERVER_HTTP, help="auto, h11 or httptools")
+    parser.add_argument("--keep-alive", type=int, default=settings.SERVER_KEEP_ALIVE_SECONDS)
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        help="Seconds to let in-flight requests finish after SIGTERM"
+    )
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    args = parse_args()
+    
+    if args.dev:
+        uvicorn.run("app.main:app", host="127.0.0.1", port=args.port, reload=True)
+    else:
+        # On SIGTERM uvicorn stops accepting connections, waits up to
+        # --graceful-timeout for in-flight requests, then runs the app's
+        # lifespan shutdown (background workers, Mongo pool).
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            loop=args.loop,
+            http=args.http,
+            timeout_keep_alive=args.keep_alive,
+            backlog=args.backlog,
+            timeout_graceful_shutdown=args.graceful_timeout,
+            proxy_headers=True,
+            access_log=False,
+        )
@@ -0,0 +1,256 @@
+"""
+Script to generate a production-sized synthetic dataset for capacity testing
+Creates faculty users and a skewed distribution of notifications per recipient
+
+Examples:
+    python seed_data.py --users 50000 --notifications 2000000
+    python seed_data.py --clean
+
+All generated documents carry "synthetic": True so they can be removed with --clean.
+Never run this against the production database.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+from bson import ObjectId
+from pymongo import MongoClient
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.services.migrations import VERSION_FIELD, current_version
+
+DEFAULT_DEPARTMENTS = [
+    "Artificial Intelligence & Machine Learning (AIML)",
+    "Civil",
+    "Computer Science (CSE)",
+    "Computer Science & Business Systems (CSBS)",
+    "Electrical & Electronics (EEE)",
+    "Electronics & Comm (ECE)",
+    "Electronics & Telecomm (ETE)",
+    "Information Science (ISE)",
+    "Mechanical (MECH)",
+]
+
+# Designation: relative weight (roughly the shape of a real college)
+DEFAULT_DESIGNATIONS = {
+    "Assistant Professor": 55,
+    "Associate Professor": 22,
+    "Professor": 10,
+    "HOD": 3,
+    "Lecturer": 6,
+    "Lab Instructor": 4,
+}
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Akash", "Ananya", "Arjun", "Bhavana", "Chetan", "Deepa", "Divya", "Ganesh",
+    "Harish", "Ishita", "Karthik", "Kavya", "Lakshmi", "Manoj", "Meera", "Naveen", "Nisha", "Pooja",
+    "Prakash", "Priya", "Rahul", "Ramesh", "Rekha", "Rohan", "Sanjay", "Shreya", "Sneha", "Suresh",
+    "Tejas", "Usha", "Varun", "Vidya", "Vikram", "Yamini",
+]
+LAST_NAMES = [
+    "Acharya", "Bhat", "Gowda", "Hegde", "Iyer", "Joshi", "Kamath", "Kulkarni", "Kumar", "Murthy",
+    "Nair", "Patil", "Prasad", "Rao", "Reddy", "Shetty", "Sharma", "Shenoy", "Srinivas", "Venkatesh",
+]
+
+NOTIFICATION_TEMPLATES = [
+    ("Meeting scheduled", "A new meeting has been scheduled for your department.", "info"),
+    ("Meeting updated", "The meeting time or venue has changed.", "warning"),
+    ("Meeting cancelled", "A meeting you were invited to has been cancelled.", "error"),
+    ("Attendance recorded", "Your attendance for the meeting has been recorded.", "success"),
+    ("Reminder", "Your meeting starts in 15 minutes.", "info"),
+    ("Profile updated", "Your profile information was updated.", "success"),
+]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed synthetic faculty and notifications")
+    parser.add_argument("--users", type=int, default=50000, help="Number of faculty users to create")
+    parser.add_argument("--notifications", type=int, default=1000000, help="Number of notifications to create")
+    parser.add_argument(
+        "--departments",
+        default=",".join(DEFAULT_DEPARTMENTS),
+        help="Comma-separated department names"
+    )
+    parser.add_argument(
+        "--designations",
+        default=",".join(f"{name}:{weight}" for name, weight in DEFAULT_DESIGNATIONS.items()),
+        help="Comma-separated designation:weight pairs"
+    )
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=1.1,
+        help="Zipf exponent for notifications per recipient (0 = uniform)"
+    )
+    parser.add_argument("--read-ratio", type=float, default=0.7, help="Fraction of notifications already read")
+    parser.add_argument("--days", type=int, default=365, help="Spread notification timestamps over this many days")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Documents per insert_many call")
+    parser.add_argument("--password", default="Faculty@123", help="Password shared by all synthetic users")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible datasets")
+    parser.add_argument("--clean", action="store_true", help="Delete previously generated synthetic data and exit")
+    return parser.parse_args()
+
+def parse_designations(value: str) -> dict:
+    designations = {}
+    for item in value.split(","):
+        name, _, weight = item.partition(":")
+        designations[name.strip()] = float(weight) if weight else 1.0
+    return designations
+
+def report(label: str, count: int, started: float):
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"   {label}: {count:,} docs in {elapsed:.1f}s ({rate:,.0f} docs/sec)")
+
+def insert_batches(collection, documents, total: int, batch_size: int, label: str):
+    """Insert generated documents with insert_many in fixed-size batches"""
+    started = time.perf_counter()
+    inserted = 0
+    batch = []
+    next_report = max(total // 10, batch_size)
+
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            collection.insert_many(batch, ordered=False)
+            inserted += len(batch)
+            batch = []
+            if inserted >= next_report:
+                report(label, inserted, started)
+                next_report += max(total // 10, batch_size)
+
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+
+    report(f"{label} (done)", inserted, started)
+    return inserted
+
+def generate_users(count: int, departments: list, designations: dict, password_hash: str, rng: random.Random):
+    names = list(designations)
+    weights = list(designations.values())
+    now = datetime.utcnow()
+
+    for i in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        completed_setup = rng.random() < 0.85
+        created_at = now - timedelta(days=rng.randint(0, 3650))
+        yield {
+            "_id": ObjectId(),
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}.{i}@synthetic.bmsit.in",
+            "phone": f"9{rng.randint(100000000, 999999999)}",
+            "department": rng.choice(departments),
+            "designation": rng.choices(names, weights)[0],
+            "employee_id": f"SYN{i:06d}",
+            "role": "faculty",
+            "bio": None,
+            "profile_picture": None,
+            "password_hash": password_hash,
+            "is_first_login": not completed_setup,
+            "password_change_required": not completed_setup,
+            "temp_password_hash": None if completed_setup else password_hash,
+            "temp_password_expiry": None if completed_setup else now + timedelta(days=settings.TEMP_PASSWORD_EXPIRY_DAYS),
+            "email_verified": completed_setup,
+            "last_password_change": created_at if completed_setup else None,
+            "failed_login_attempts": 0,
+            "account_locked": False,
+            "created_at": created_at,
+            "updated_at": created_at,
+            VERSION_FIELD: current_version("users"),
+            "synthetic": True,
+        }
+
+def generate_notifications(count: int, recipient_ids: list, skew: float, read_ratio: float, days: int, rng: random.Random):
+    # Zipf-like weights: a few recipients get most notifications, like department heads
+    weights = [1.0 / ((rank + 1) ** skew) for rank in range(len(recipient_ids))]
+    cum_weights = list(accumulate(weights))
+    shuffled_ids = recipient_ids[:]
+    rng.shuffle(shuffled_ids)
+    now = datetime.utcnow()
+    chunk = 10000
+
+    generated = 0
+    while generated < count:
+        size = min(chunk, count - generated)
+        for recipient_id in rng.choices(shuffled_ids, cum_weights=cum_weights, k=size):
+            title, message, notification_type = rng.choice(NOTIFICATION_TEMPLATES)
+            created_at = now - timedelta(seconds=rng.randint(0, days * 86400))
+            read = rng.random() < read_ratio
+            yield {
+                "title": title,
+                "message": message,
+                "type": notification_type,
+                "read": read,
+                "recipient_id": recipient_id,
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(minutes=rng.randint(1, 600)) if read else created_at,
+                "digested_at": None,
+                VERSION_FIELD: current_version("notifications"),
+                "synthetic": True,
+            }
+        generated += size
+
+def clean(database):
+    for name in ("notifications", "users"):
+        result = database[name].delete_many({"synthetic": True})
+        print(f"🧹 Deleted {result.deleted_count:,} synthetic documents from {name}")
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    client = MongoClient(settings.MONGODB_URL, serverSelectionTimeoutMS=5000)
+
+    try:
+        client.server_info()
+        print(f"✅ Connected to MongoDB ({settings.MONGODB_DATABASE})")
+        database = client[settings.MONGODB_DATABASE]
+
+        if args.clean:
+            clean(database)
+            return
+
+        departments = [d.strip() for d in args.departments.split(",") if d.strip()]
+        designations = parse_designations(args.designations)
+
+        # bcrypt is deliberately slow; hashing once keeps seeding I/O-bound
+        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        password_hash = pwd_context.hash(args.password)
+
+        print(f"\n👥 Creating {args.users:,} faculty across {len(departments)} departments...")
+        recipient_ids = []
+
+        def users_with_ids():
+            for user in generate_users(args.users, departments, designations, password_hash, rng):
+                recipient_ids.append(str(user["_id"]))
+                yield user
+
+        insert_batches(database["users"], users_with_ids(), args.users, args.batch_size, "users")
+
+        if args.notifications and recipient_ids:
+            print(f"\n🔔 Creating {args.notifications:,} notifications (skew={args.skew})...")
+            insert_batches(
+                database["notifications"],
+                generate_notifications(
+                    args.notifications, recipient_ids, args.skew, args.read_ratio, args.days, rng
+                ),
+                args.notifications,
+                args.batch_size,
+                "notifications"
+            )
+
+        print(f"\n✅ Done. Synthetic users share the password: {args.password}")
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("BMSIT Faculty Portal - Synthetic Dataset Generator")
+    print("=" * 60)
+    main()
+    print("=" * 60)